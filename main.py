@@ -10,15 +10,20 @@ import threading
 import queue
 import time
 import json
+import re
 import shutil
+import struct
+import io
 import concurrent.futures
+from collections import Counter, deque
+from fractions import Fraction
 from pathlib import Path
 
 # PyQt imports
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QGridLayout, QFormLayout, QLabel, QPushButton, QProgressBar,
-    QTextEdit, QTabWidget, QFrame, QGroupBox, QCheckBox, QRadioButton,
+    QTextEdit, QPlainTextEdit, QTabWidget, QFrame, QGroupBox, QCheckBox, QRadioButton,
     QComboBox, QLineEdit, QScrollArea, QSplitter, QFileDialog,
     QMessageBox, QInputDialog, QDialog, QDialogButtonBox, QTextBrowser,
     QButtonGroup, QSpinBox, QDoubleSpinBox, QTimeEdit, QDateTimeEdit,
@@ -33,19 +38,86 @@ from PyQt5.QtGui import (
     QGuiApplication, QDesktopServices
 )
 
+# Optional fast JSON backend; falls back to the standard json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # =============================================================================
 # CONSTANTS AND CONFIGURATION
 # =============================================================================
 WINDOW_WIDTH = 575
 WINDOW_HEIGHT = 475
 PROGRESS_UPDATE_INTERVAL = 100  # milliseconds
-MAX_QUEUE_MESSAGES_PER_UPDATE = 10  # Maximum messages to process per UI update
-FFPROBE_TIMEOUT = 5   # seconds (reduced for faster failure detection)
-FPS_SCAN_TIMEOUT = 8  # seconds (reduced for faster failure detection)
+BACKLOG_UPDATE_INTERVAL = PROGRESS_UPDATE_INTERVAL // 2  # milliseconds - used while worker messages are still queued
+QUEUE_DRAIN_TIME_BUDGET = 0.005  # seconds - max time per UI update spent draining worker messages
+# Messages that only set a widget to their latest value; older ones in a batch are dropped
+COALESCED_MESSAGE_TYPES = frozenset({"SCAN_PROGRESS", "PROGRESS", "CURRENT_FILE", "STATUS", "PARALLEL_STATUS"})
+SKIP_FEEDBACK_DURATION = 300  # milliseconds - how long the skip button shows "Skipping..."
+SETTINGS_SAVE_DELAY = 300  # milliseconds - settings changes are written once after this quiet period
+SETTINGS_CLOSE_TIMEOUT = 1.0  # seconds - how long closing waits for the final settings write
+FFPROBE_TIMEOUT = 8  # seconds - covers the single combined streams/format probe
+# Capped ffprobe read (analyzeduration is in microseconds; 0 would mean ffprobe's 5 s default).
+# A full probe is retried if the capped probe fails or misses the video stream/fps
+FFPROBE_FAST_ARGS = ["-probesize", "500K", "-analyzeduration", "1000000"]
+# Everything _probe_file reads comes from this one JSON report
+FFPROBE_ENTRY_ARGS = ["-print_format", "json",
+                      "-show_entries",
+                      "format=duration:stream=index,codec_type,codec_name,channels,avg_frame_rate:stream_tags=language"]
+PROBE_CACHE_FILENAME = "probe_cache.json"
+PROBE_CACHE_MAX_ENTRIES = 10000  # Oldest entries are dropped beyond this
+PROBE_CACHE_VERSION = 2  # Bump when the stored probe fields change; caches with another version are discarded
 PROCESS_TIMEOUT = 3600  # seconds (1 hour) - timeout for individual file processing
+FFMPEG_STOP_TIMEOUT = 2  # seconds - grace period after terminate() before FFmpeg is killed
+CLOSE_CLEANUP_TIMEOUT = FFMPEG_STOP_TIMEOUT + 1  # seconds - how long closing waits for the remux worker to clean up
+# Hide console windows for ffmpeg/ffprobe on Windows
+SUBPROCESS_CREATION_FLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+SCAN_WORKERS_PER_CPU = 4  # Scan threads per core (probes are I/O/subprocess bound)
+SCAN_MAX_WORKERS = 32  # Upper bound on parallel scan threads
+SCAN_PROGRESS_INTERVAL = 0.1  # seconds - minimum time between scan progress messages
 LOG_TEXT_HEIGHT = 8
+LOG_SEPARATOR = "=" * 70  # Session/run header rule in the log
+LOG_MAX_LINES = 10000  # Oldest log lines are dropped beyond this so appends stay fast in long sessions
+FFMPEG_READ_CHUNK_SIZE = 64 * 1024  # bytes - max read from the ffmpeg output pipe
+
+# FFmpeg output matching (bytes; lines are only decoded when logged)
+# Structured progress: ffmpeg writes key=value lines to stdout, each block ending in progress=...
+FFMPEG_PROGRESS_ARGS = ("-nostats", "-progress", "pipe:1")
+FFMPEG_PROGRESS_PATTERN = re.compile(rb'([a-z0-9_]+)=(.*)')
+FFMPEG_PROGRESS_LOG_KEYS = (b"frame", b"fps", b"total_size", b"out_time", b"bitrate", b"speed")
+FFMPEG_LINE_BREAK_PATTERN = re.compile(rb'[\r\n]')  # Progress lines end with '\r'
+
+# Fixed FFmpeg audio arguments, shared by every command in a batch
+FFMPEG_AUDIO_COPY_ARGS = ("-map", "0:v", "-map", "0:a", "-c:a", "copy")  # Map all audio streams
+FFMPEG_NO_AUDIO_ARGS = ("-an",)
 DEFAULT_TIMESCALE = "30"
 
+# Shared QGroupBox style (one string reused by every section box)
+GROUP_BOX_STYLE = """
+QGroupBox {
+    background-color: #f7f7f7;
+    border: 1px solid #e0e0e0;
+    border-radius: 8px;
+    margin-top: 10px;
+}
+QGroupBox::title {
+    font-weight: bold;
+    font-size: 9pt;
+    subcontrol-origin: margin;
+    padding: 0 5px;
+}
+"""
+
+# Supported formats (lowercase tuples, so str.endswith can test them in one call)
+SUPPORTED_INPUT_EXTENSIONS = ('.mkv',)
+SUPPORTED_OUTPUT_FORMATS = ('.mp4', '.mov')
+# Name filter for the "Select video files" dialog, e.g. "All supported (*.mkv);;.MKV files (*.mkv)"
+INPUT_FILE_DIALOG_FILTER = ";;".join(
+    [f"All supported ({' '.join(f'*{ext}' for ext in SUPPORTED_INPUT_EXTENSIONS)})"]
+    + [f"{ext.upper()} files (*{ext})" for ext in SUPPORTED_INPUT_EXTENSIONS]
+)
+
 # File operation modes
 FILE_ACTION_MOVE = "move"
 FILE_ACTION_KEEP = "keep"
@@ -55,6 +127,40 @@ FILE_ACTION_DELETE = "delete"
 UI_STATE_DISABLED = False
 UI_STATE_NORMAL = True
 
+# Container header parsing (used to skip ffprobe for MKV scans)
+MKV_HEADER_EXTENSIONS = ('.mkv', '.webm')
+MKV_FPS_MAX_DENOMINATOR = 30000  # Same limit ffmpeg's matroska demuxer uses for avg_frame_rate
+
+# Matroska/EBML element IDs
+EBML_ID_SEGMENT = 0x18538067
+EBML_ID_INFO = 0x1549A966
+EBML_ID_TIMECODE_SCALE = 0x2AD7B1
+EBML_ID_DURATION = 0x4489
+EBML_ID_TRACKS = 0x1654AE6B
+EBML_ID_TRACK_ENTRY = 0xAE
+EBML_ID_TRACK_TYPE = 0x83
+EBML_ID_CODEC_ID = 0x86
+EBML_ID_LANGUAGE = 0x22B59C
+EBML_ID_DEFAULT_DURATION = 0x23E383
+EBML_ID_AUDIO = 0xE1
+EBML_ID_CHANNELS = 0x9F
+EBML_ID_CLUSTER = 0x1F43B675
+
+# =============================================================================
+# JSON HELPERS
+# =============================================================================
+def load_json_bytes(data):
+    """Parse JSON from bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dump_json_bytes(obj, indent=False):
+    """Serialize an object to JSON bytes (2-space indent if requested), using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
 # =============================================================================
 # MAIN APPLICATION CLASS - RemuxApp
 # =============================================================================
@@ -104,6 +210,8 @@ class RemuxApp(QMainWindow):
         # print(f"[DEBUG] Main window created: {self.windowTitle()} at position ({self.x()}, {self.y()}) size ({self.width()}, {self.height()})")
 
         # --- Application State ---
+        # Set before the tool check: closeEvent reads it even if __init__ stops early below
+        self.is_remuxing = False  # True from the start of a remux until the UI is reset
         # Check for required tools (ffmpeg and ffprobe) at startup
         self.ffmpeg_path = self.find_ffmpeg_path()
         self.ffprobe_path = self.find_ffprobe_path()
@@ -122,12 +230,14 @@ class RemuxApp(QMainWindow):
         self.files_to_process = []
         self.scan_results = {}
         self.is_scanned = False
-        self.process_queue = queue.Queue()
+        self.process_queue = deque()  # Worker -> UI messages (append/popleft are thread-safe)
         self.current_process = None
+        self.remux_thread = None
+        self.current_file_index = 0
+        self.countdown_timer = None  # Preview auto-start countdown (created per dialog)
         self.selected_output_directory = ""  # Track user-selected output directory
 
-        # --- Threading locks for safety ---
-        self.state_lock = threading.Lock()
+        # --- Threading lock for safety (guards current_process) ---
         self.process_lock = threading.Lock()
 
         # --- Threading Events ---
@@ -136,6 +246,20 @@ class RemuxApp(QMainWindow):
         self.cancel_event = threading.Event()
         self.skip_event = threading.Event()
 
+        # --- Probe cache (loaded lazily on first scan) ---
+        self.probe_cache = None
+        self.probe_cache_dirty = False
+        self.probe_cache_lock = threading.Lock()
+        # Notified whenever pause/cancel/skip changes so waiting workers wake immediately
+        self.control_condition = threading.Condition()
+
+        # --- Settings writer (keeps settings file I/O off the UI thread) ---
+        self.settings_write_queue = queue.Queue(maxsize=1)  # Only the latest pending save is kept
+        self.settings_write_done = threading.Event()  # Set while no save is queued or being written
+        self.settings_write_done.set()
+        self.settings_write_lock = threading.Lock()  # Keeps the queue and settings_write_done in step
+        threading.Thread(target=self.settings_writer_loop, daemon=True).start()
+
         # --- Statistics ---
         self.processing_start_time = None  # Track when processing starts for elapsed time
         self.scan_start_time = None  # Track when scanning starts for elapsed time
@@ -143,8 +267,8 @@ class RemuxApp(QMainWindow):
 
         # --- Supported formats ---
         self.supported_formats = {
-            'input': ['.mkv'],
-            'output': ['.mp4', '.mov']
+            'input': SUPPORTED_INPUT_EXTENSIONS,
+            'output': SUPPORTED_OUTPUT_FORMATS
         }
 
         # --- Settings Variables ---
@@ -160,6 +284,8 @@ class RemuxApp(QMainWindow):
 
         # --- Settings State ---
         self.settings_disabled = False
+        self.settings_loading = False  # Suppresses auto-save during bulk setting changes
+        self.settings_file_path = None  # Resolved once by get_settings_file_path
 
         # Create UI
         self.create_widgets()
@@ -183,6 +309,14 @@ class RemuxApp(QMainWindow):
 
     def setup_auto_save(self):
         """Set up auto-save functionality for settings."""
+        # Debounce saves: each change restarts the timer, so a burst of changes writes once
+        self.settings_save_timer = QTimer(self)
+        self.settings_save_timer.setSingleShot(True)
+        self.settings_save_timer.setInterval(SETTINGS_SAVE_DELAY)
+        self.settings_save_timer.timeout.connect(self.save_settings)
+
+    def connect_settings_signals(self):
+        """Connect the settings controls to their update handlers (called once the tab is built)."""
         # Connect all setting controls to auto-save when changed
         # Checkboxes
         self.audio_checkbox.stateChanged.connect(self.update_checkbox_settings)
@@ -198,18 +332,14 @@ class RemuxApp(QMainWindow):
         # Combos and Line Edits
         self.output_format_combo.currentTextChanged.connect(self.update_output_format_setting)
 
-        # Connect all update handlers to also trigger auto-save
-        for widget in self.settings_tab.findChildren(QWidget):
-            if isinstance(widget, (QCheckBox, QRadioButton, QComboBox, QLineEdit)):
-                if hasattr(widget, 'stateChanged'): widget.stateChanged.connect(self.auto_save_settings)
-                if hasattr(widget, 'toggled'): widget.toggled.connect(self.auto_save_settings)
-                if hasattr(widget, 'currentTextChanged'): widget.currentTextChanged.connect(self.auto_save_settings)
-                if hasattr(widget, 'textChanged'): widget.textChanged.connect(self.auto_save_settings)
+        # Each update handler above triggers the auto-save itself, so a change fires exactly one
 
     def auto_save_settings(self):
-        """Auto-save settings when they change."""
+        """Schedule a settings save once changes settle."""
+        if self.settings_loading:
+            return  # Bulk updates (e.g. restore defaults) save once when done
         try:
-            self.save_settings()
+            self.settings_save_timer.start()
             # Settings are saved automatically without user notification
             # to prevent UI shifting issues with status bar access
         except Exception as e:
@@ -238,10 +368,24 @@ class RemuxApp(QMainWindow):
         self.tab_widget.addTab(self.settings_tab, "Settings")
         self.tab_widget.addTab(self.logs_tab, "Logs")
 
-        # Create widgets for each tab
+        # Create widgets for each tab; the Settings tab is built the first time it's shown
         self.create_remuxer_widgets()
-        self.create_settings_widgets()
         self.create_logs_widgets()
+        self.settings_tab_built = False
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+
+        # Hide Step 2 initially - only show after scanning files
+        self.progress_group.hide()
+
+        # Load saved settings into the setting attributes (the settings widgets read them when built)
+        self.load_settings()
+
+    def on_tab_changed(self, index):
+        """Build the Settings tab on first view."""
+        if not self.settings_tab_built and self.tab_widget.widget(index) is self.settings_tab:
+            self.settings_tab_built = True
+            self.create_settings_widgets()
+            self.connect_settings_signals()
 
     def create_remuxer_widgets(self):
         """Create widgets for the remuxer tab."""
@@ -253,20 +397,7 @@ class RemuxApp(QMainWindow):
         source_output_group = QGroupBox("Import")
         # ADD THIS STYLESHEET for consistent, compact appearance
         # Modern stylesheet for a consistent, clean appearance
-        source_output_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                border-radius: 8px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                font-weight: bold;
-                font-size: 9pt;
-                subcontrol-origin: margin;
-                padding: 0 5px;
-            }
-        """)
+        source_output_group.setStyleSheet(GROUP_BOX_STYLE)
         layout.addWidget(source_output_group)
 
         source_output_layout = QGridLayout(source_output_group)
@@ -277,7 +408,6 @@ class RemuxApp(QMainWindow):
         # Source folder selection row
         source_output_layout.addWidget(QLabel("Source:"), 0, 0)
         self.label_input_path = QLabel("No folder or files selected")
-        self.label_input_path.setWordWrap(True)
         source_output_layout.addWidget(self.label_input_path, 0, 1, 1, 2)
         self.btn_browse_folder = QPushButton("Browse Folder")
         self.btn_browse_folder.clicked.connect(self.browse_input_folder)
@@ -296,6 +426,8 @@ class RemuxApp(QMainWindow):
         self.btn_clear_output = QPushButton("Clear")
         self.btn_clear_output.clicked.connect(self.clear_output_folder)
         source_output_layout.addWidget(self.btn_clear_output, 1, 4)
+        # Locked together while a scan or remux is running
+        self.source_buttons = (self.btn_browse_folder, self.btn_browse_files, self.btn_browse_output, self.btn_clear_output)
 
         # --- Scanning Frame (Hidden - scanning happens automatically) ---
         self.scan_group = QGroupBox("Preparing files")
@@ -357,20 +489,7 @@ class RemuxApp(QMainWindow):
         self.progress_group = QGroupBox("Remux")
         # ADD THIS STYLESHEET for consistent, compact appearance
         # Modern stylesheet for a consistent, clean appearance
-        self.progress_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                border-radius: 8px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                font-weight: bold;
-                font-size: 9pt;
-                subcontrol-origin: margin;
-                padding: 0 5px;
-            }
-        """)
+        self.progress_group.setStyleSheet(GROUP_BOX_STYLE)
         layout.addWidget(self.progress_group)
 
         progress_layout = QVBoxLayout(self.progress_group)
@@ -382,20 +501,7 @@ class RemuxApp(QMainWindow):
         current_activity_group = QGroupBox("Current Activity")
         # ADD THIS STYLESHEET for consistent, compact appearance
         # Modern stylesheet for a consistent, clean appearance
-        current_activity_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                border-radius: 8px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                font-weight: bold;
-                font-size: 9pt;
-                subcontrol-origin: margin;
-                padding: 0 5px;
-            }
-        """)
+        current_activity_group.setStyleSheet(GROUP_BOX_STYLE)
         progress_layout.addWidget(current_activity_group)
 
         current_layout = QVBoxLayout(current_activity_group)
@@ -454,6 +560,11 @@ class RemuxApp(QMainWindow):
         self.btn_skip.clicked.connect(self.skip_current_file)
         self.btn_skip.setEnabled(False)
         buttons_layout.addWidget(self.btn_skip)
+        # One reusable timer restores the label after "Skipping..." (restarted on repeat clicks)
+        self.skip_feedback_timer = QTimer(self)
+        self.skip_feedback_timer.setSingleShot(True)
+        self.skip_feedback_timer.setInterval(SKIP_FEEDBACK_DURATION)
+        self.skip_feedback_timer.timeout.connect(lambda: self.btn_skip.setText("Skip Current"))
 
         self.btn_cancel = QPushButton("Cancel")
         self.btn_cancel.clicked.connect(self.cancel_processing)
@@ -476,20 +587,7 @@ class RemuxApp(QMainWindow):
         output_format_group = QGroupBox("Output Format")
         # ADD THIS STYLESHEET to control the box's own margins and title padding
         # Modern stylesheet for a consistent, clean appearance
-        output_format_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                border-radius: 8px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                font-weight: bold;
-                font-size: 9pt;
-                subcontrol-origin: margin;
-                padding: 0 5px;
-            }
-        """)
+        output_format_group.setStyleSheet(GROUP_BOX_STYLE)
         layout.addWidget(output_format_group)
 
         format_layout = QHBoxLayout(output_format_group)
@@ -511,20 +609,7 @@ class RemuxApp(QMainWindow):
         file_options_group = QGroupBox("Original File Management")
         # ADD THIS STYLESHEET to control the box's own margins and title padding
         # Modern stylesheet for a consistent, clean appearance
-        file_options_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                border-radius: 8px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                font-weight: bold;
-                font-size: 9pt;
-                subcontrol-origin: margin;
-                padding: 0 5px;
-            }
-        """)
+        file_options_group.setStyleSheet(GROUP_BOX_STYLE)
         layout.addWidget(file_options_group)
 
         file_layout = QVBoxLayout(file_options_group)
@@ -569,20 +654,7 @@ class RemuxApp(QMainWindow):
         processing_group = QGroupBox("Processing Options")
         # ADD THIS STYLESHEET to control the box's own margins and title padding
         # Modern stylesheet for a consistent, clean appearance
-        processing_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                border-radius: 8px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                font-weight: bold;
-                font-size: 9pt;
-                subcontrol-origin: margin;
-                padding: 0 5px;
-            }
-        """)
+        processing_group.setStyleSheet(GROUP_BOX_STYLE)
         layout.addWidget(processing_group)
 
         processing_layout = QVBoxLayout(processing_group)
@@ -633,20 +705,7 @@ class RemuxApp(QMainWindow):
         advanced_group = QGroupBox("Advanced Processing Options")
         # ADD THIS STYLESHEET to control the box's own margins and title padding
         # Modern stylesheet for a consistent, clean appearance
-        advanced_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                border-radius: 8px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                font-weight: bold;
-                font-size: 9pt;
-                subcontrol-origin: margin;
-                padding: 0 5px;
-            }
-        """)
+        advanced_group.setStyleSheet(GROUP_BOX_STYLE)
         layout.addWidget(advanced_group)
 
         advanced_layout = QVBoxLayout(advanced_group)
@@ -710,15 +769,9 @@ class RemuxApp(QMainWindow):
 
         settings_buttons_layout.addStretch(1)  # Add stretchable space on the right
 
-        # Hide Step 2 initially - only show after scanning files
-        self.progress_group.hide()
-
         # Add stretch at the end to push content to top when window is resized
         layout.addStretch(1)
 
-        # Load saved settings after creating all widgets
-        self.load_settings()
-
     def create_logs_widgets(self):
         """Create widgets for the logs tab."""
         layout = QVBoxLayout(self.logs_tab)
@@ -730,20 +783,7 @@ class RemuxApp(QMainWindow):
         log_group.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         # ADD THIS STYLESHEET for consistent, compact appearance
         # Modern stylesheet for a consistent, clean appearance
-        log_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                border-radius: 8px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                font-weight: bold;
-                font-size: 9pt;
-                subcontrol-origin: margin;
-                padding: 0 5px;
-            }
-        """)
+        log_group.setStyleSheet(GROUP_BOX_STYLE)
         layout.addWidget(log_group)
 
         log_layout = QVBoxLayout(log_group)
@@ -775,6 +815,7 @@ class RemuxApp(QMainWindow):
         self.log_text.setReadOnly(True)
         self.log_text.setFont(QFont("Consolas", 9))  # Better monospace font
         self.log_text.setLineWrapMode(QTextEdit.NoWrap)  # No word wrapping
+        self.log_text.document().setMaximumBlockCount(LOG_MAX_LINES)
 
         # Set log text styling for better readability
         self.log_text.setStyleSheet("""
@@ -828,7 +869,13 @@ class RemuxApp(QMainWindow):
     # SETTINGS MANAGEMENT
     # =============================================================================
     def get_settings_file_path(self):
-        """Get the path to the settings file."""
+        """Get the path to the settings file (resolved on first use, then reused)."""
+        if self.settings_file_path is None:
+            self.settings_file_path = self.resolve_settings_file_path()
+        return self.settings_file_path
+
+    def resolve_settings_file_path(self):
+        """Work out where the settings file lives for this install."""
         try:
             # When running as an executable, use AppData for settings
             if getattr(sys, 'frozen', False):
@@ -847,7 +894,7 @@ class RemuxApp(QMainWindow):
             return "remuxer_settings.json"
 
     def save_settings(self):
-        """Save current settings to file."""
+        """Queue the current settings for the writer thread (settings_write_done is set once written)."""
         try:
             settings = {
                 "include_audio": self.include_audio,
@@ -860,56 +907,71 @@ class RemuxApp(QMainWindow):
                 "use_timescale": self.use_timescale_option,
             }
 
-            with open(self.get_settings_file_path(), 'w') as f:
-                json.dump(settings, f, indent=2)
+            # Replace any save still waiting so only the newest settings get written
+            with self.settings_write_lock:
+                while True:
+                    try:
+                        self.settings_write_queue.put_nowait(settings)
+                        break
+                    except queue.Full:
+                        try:
+                            self.settings_write_queue.get_nowait()
+                        except queue.Empty:
+                            pass
+                self.settings_write_done.clear()
 
         except Exception as e:
             print(f"Failed to save settings: {e}")
 
+    def settings_writer_loop(self):
+        """Write queued settings to disk (runs on a daemon thread)."""
+        while True:
+            settings = self.settings_write_queue.get()
+            try:
+                settings_file = self.get_settings_file_path()
+                temp_file = settings_file + ".tmp"
+                with open(temp_file, 'wb') as f:
+                    f.write(dump_json_bytes(settings, indent=True))
+                os.replace(temp_file, settings_file)
+            except Exception as e:
+                print(f"Failed to save settings: {e}")
+            finally:
+                with self.settings_write_lock:
+                    if self.settings_write_queue.empty():
+                        self.settings_write_done.set()
+
     def load_settings(self):
-        """Load settings from file."""
+        """Load settings from file into the setting attributes."""
         try:
             settings_file = self.get_settings_file_path()
             if os.path.exists(settings_file):
-                with open(settings_file, 'r') as f:
-                    settings = json.load(f)
+                with open(settings_file, 'rb') as f:
+                    settings = load_json_bytes(f.read())
 
                 # Apply loaded settings
                 if "include_audio" in settings:
                     self.include_audio = settings["include_audio"]
-                    self.audio_checkbox.setChecked(self.include_audio)
                 if "file_action" in settings:
                     self.file_action = settings["file_action"]
-                    if self.file_action == FILE_ACTION_MOVE:
-                        self.move_radio.setChecked(True)
-                    elif self.file_action == FILE_ACTION_KEEP:
-                        self.keep_radio.setChecked(True)
-                    elif self.file_action == FILE_ACTION_DELETE:
-                        self.delete_radio.setChecked(True)
                 if "output_format" in settings:
                     self.output_format = settings["output_format"]
-                    self.output_format_combo.setCurrentText(self.output_format)
                 if "validate_files" in settings:
                     self.validate_files = settings["validate_files"]
-                    self.validate_checkbox.setChecked(self.validate_files)
                 if "preserve_timestamps" in settings:
                     self.preserve_timestamps = settings["preserve_timestamps"]
-                    self.timestamp_checkbox.setChecked(self.preserve_timestamps)
                 if "preview_commands" in settings:
                     self.preview_commands = settings["preview_commands"]
-                    self.preview_checkbox.setChecked(self.preview_commands)
                 if "overwrite_existing" in settings:
                     self.overwrite_existing = settings["overwrite_existing"]
-                    self.overwrite_checkbox.setChecked(self.overwrite_existing)
                 if "use_timescale" in settings:
                     self.use_timescale_option = settings["use_timescale"]
-                    self.timescale_checkbox.setChecked(self.use_timescale_option)
 
         except Exception as e:
             print(f"Failed to load settings: {e}")
 
     def restore_defaults(self):
         """Restore all settings to their default values."""
+        self.settings_loading = True
         try:
             # Reset all settings to defaults
             self.include_audio = True
@@ -931,6 +993,76 @@ class RemuxApp(QMainWindow):
 
         except Exception as e:
             print(f"Failed to restore defaults: {e}")
+        finally:
+            self.settings_loading = False
+        self.auto_save_settings()
+
+    # =============================================================================
+    # PROBE CACHE
+    # =============================================================================
+    def get_probe_cache_file_path(self):
+        """Get the path to the on-disk probe cache (stored next to the settings file)."""
+        return os.path.join(os.path.dirname(self.get_settings_file_path()), PROBE_CACHE_FILENAME)
+
+    def get_probe_cache_key(self, file_path):
+        """Build a cache key that changes whenever the file is modified."""
+        stat_info = os.stat(file_path)
+        return f"{os.path.abspath(file_path)}|{stat_info.st_size}|{stat_info.st_mtime_ns}"
+
+    def load_probe_cache(self):
+        """Load the probe cache from disk. Caller must hold probe_cache_lock."""
+        self.probe_cache = {}
+        try:
+            cache_file = self.get_probe_cache_file_path()
+            if os.path.exists(cache_file):
+                with open(cache_file, 'rb') as f:
+                    data = load_json_bytes(f.read())
+                if data.get('version') == PROBE_CACHE_VERSION:
+                    self.probe_cache = data['entries']
+        except Exception as e:
+            print(f"Failed to load probe cache: {e}")
+
+    def lookup_probe_cache(self, cache_key):
+        """Return cached probe info for a key, or None on a miss.
+
+        The in-memory dict also serves as the per-session memo: it is kept even when
+        the disk cache can't be read or written, so unchanged files are probed once.
+        """
+        with self.probe_cache_lock:
+            if self.probe_cache is None:
+                self.load_probe_cache()
+            probe = self.probe_cache.pop(cache_key, None)
+            if probe is not None:
+                # Re-insert so eviction drops the least recently used entries first.
+                # A hit alone doesn't mark the cache dirty; the order is saved with the next change.
+                self.probe_cache[cache_key] = probe
+            return probe
+
+    def store_probe_cache(self, cache_key, probe):
+        """Add probe info to the in-memory cache; written to disk by save_probe_cache."""
+        with self.probe_cache_lock:
+            if self.probe_cache is None:
+                self.load_probe_cache()
+            self.probe_cache[cache_key] = probe
+            # Dicts keep insertion order and hits are re-inserted, so the first keys are least recently used
+            while len(self.probe_cache) > PROBE_CACHE_MAX_ENTRIES:
+                del self.probe_cache[next(iter(self.probe_cache))]
+            self.probe_cache_dirty = True
+
+    def save_probe_cache(self):
+        """Write the probe cache to disk if it changed, via a temp file for crash safety."""
+        with self.probe_cache_lock:
+            if not self.probe_cache_dirty:
+                return
+            try:
+                cache_file = self.get_probe_cache_file_path()
+                temp_file = cache_file + ".tmp"
+                with open(temp_file, 'wb') as f:
+                    f.write(dump_json_bytes({'version': PROBE_CACHE_VERSION, 'entries': self.probe_cache}))
+                os.replace(temp_file, cache_file)
+                self.probe_cache_dirty = False
+            except Exception as e:
+                print(f"Failed to save probe cache: {e}")
 
     # =============================================================================
     # UTILITY METHODS
@@ -1083,166 +1215,192 @@ class RemuxApp(QMainWindow):
     # =============================================================================
     def check_queue(self):
         """Process messages from the worker threads and update the UI accordingly."""
-        try:
-            # Process up to MAX_QUEUE_MESSAGES_PER_UPDATE messages per iteration to prevent UI blocking
-            for _ in range(MAX_QUEUE_MESSAGES_PER_UPDATE):
-                message = self.process_queue.get_nowait()
-                msg_type, data = message
-
-                # --- Skip Button Reset Message ---
-                if msg_type == "SKIP_BUTTON_RESET":
-                    self.btn_skip.setEnabled(True)
-                    self.btn_skip.setText("Skip Current")
-
-                # --- Scan Messages ---
-                elif msg_type == "SCAN_PROGRESS":
-                    # Drive slim bottom bar; keep panel out of the way
-                    try:
-                        self.scan_status_bar.setValue(int(data['percent']))
-                        if not self.scan_status_bar.isVisible():
-                            self.scan_status_bar.show()
-                    except Exception:
-                        pass
+        # Drain for up to a fixed time budget so a burst of output never backs up the queue
+        deadline = time.perf_counter() + QUEUE_DRAIN_TIME_BUDGET
+        messages = []
+        while time.perf_counter() < deadline:
+            try:
+                messages.append(self.process_queue.popleft())
+            except IndexError:
+                break
 
-                elif msg_type == "SCAN_COMPLETE":
-                    self.scan_results = data['results']
-                    self.is_scanned = True
-                    valid_files = sum(1 for v in data['results'].values() if v.get('valid', True))
-                    total_files = len(data['results'])
+        # Progress-style messages only display their newest value, so apply just the last of each
+        last_index = {msg_type: i for i, (msg_type, _) in enumerate(messages) if msg_type in COALESCED_MESSAGE_TYPES}
+        log_lines = []  # Consecutive log lines are appended to the log widget in one call
+        for i, (msg_type, data) in enumerate(messages):
+            if msg_type in COALESCED_MESSAGE_TYPES and last_index[msg_type] != i:
+                continue
+            if msg_type == "LOG":
+                line = self.format_log_message(data)
+                if line is not None:
+                    log_lines.append(line)
+                continue
+            if log_lines:
+                # Flush first: other handlers may write to the log too, and order must hold
+                self.append_log_lines(log_lines)
+                log_lines = []
+            self.handle_queue_message(msg_type, data)
+        if log_lines:
+            self.append_log_lines(log_lines)
+
+        # Come back sooner while the budget ran out with messages still waiting
+        interval = BACKLOG_UPDATE_INTERVAL if self.process_queue else PROGRESS_UPDATE_INTERVAL
+        if self.timer.interval() != interval:
+            self.timer.setInterval(interval)
+
+    def format_log_message(self, data):
+        """Timestamp a worker log message, or return None if simple mode filters it out."""
+        # Lightweight log mode: filter noisy/verbose lines unless debug is enabled
+        message = str(data)
+
+        if not self.debug_mode:
+            m = message.strip()
+            # Drop debug/verbose patterns
+            if (
+                m.startswith("[DEBUG]") or
+                m.startswith("Detected Frame Rates") or
+                (m.startswith("  - ") and not m.startswith("Frame rates:")) or
+                (m.startswith("- ") and not m.startswith("Frame rates:")) or
+                m.startswith("• ") and False or
+                m.startswith("   -> [DEBUG]") or
+                m.startswith("   -> Success") or
+                (len(m) > 0 and set(m) == {"="})
+            ):
+                # Skip adding this line in simple mode
+                return None
+
+        # Format log messages with timestamps for better readability
+        timestamp = time.strftime("%H:%M:%S")
+        return f"[{timestamp}] {message}"
+
+    def append_log_lines(self, lines):
+        """Append formatted log lines in one update and scroll to the bottom."""
+        self.log_text.append("\n".join(lines))
+        # Scroll to bottom
+        scrollbar = self.log_text.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
+
+    def handle_queue_message(self, msg_type, data):
+        """Apply a single worker message to the UI."""
+        # --- Skip Button Reset Message ---
+        if msg_type == "SKIP_BUTTON_RESET":
+            self.btn_skip.setEnabled(True)
+            self.btn_skip.setText("Skip Current")
+
+        # --- Scan Messages ---
+        elif msg_type == "SCAN_PROGRESS":
+            # Drive slim bottom bar; keep panel out of the way
+            try:
+                self.scan_status_bar.setValue(int(data['percent']))
+                if not self.scan_status_bar.isVisible():
+                    self.scan_status_bar.show()
+            except Exception:
+                pass
 
-                    # DEBUG: Log a simple confirmation that the scan is complete.
-                    # The detailed per-file logs have already been sent from the worker.
-                    if self.debug_mode:
-                        self.log_text.append(f"[DEBUG] SCAN_COMPLETE received")
-
-                    # Calculate final scan elapsed time
-                    final_elapsed_time = None
-                    if self.scan_start_time:
-                        elapsed_seconds = int(time.time() - self.scan_start_time)
-                        hours, remainder = divmod(elapsed_seconds, 3600)
-                        minutes, seconds = divmod(remainder, 60)
-                        if hours > 0:
-                            final_elapsed_time = f"{hours}h {minutes}m {seconds}s"
-                        else:
-                            final_elapsed_time = f"{minutes}m {seconds}s"
-                        self.scan_start_time = None  # Reset timer
-                        self.last_scan_time_str = final_elapsed_time # Store for completion dialog
+        elif msg_type == "SCAN_COMPLETE":
+            self.scan_results = data['results']
+            self.is_scanned = True
+            valid_files = sum(1 for v in data['results'].values() if v.get('valid', True))
+            total_files = len(data['results'])
 
-                    # Update scan progress label
-                    if valid_files == total_files:
-                        self.label_scan_progress.setText(f"✓ {valid_files}/{total_files} files ready to remux")
-                    else:
-                        self.label_scan_progress.setText(f"⚠ {valid_files}/{total_files} files ready to remux")
+            # DEBUG: Log a simple confirmation that the scan is complete.
+            # The detailed per-file logs have already been sent from the worker.
+            if self.debug_mode:
+                self.log_text.append(f"[DEBUG] SCAN_COMPLETE received")
+
+            # Calculate final scan elapsed time
+            final_elapsed_time = None
+            if self.scan_start_time:
+                elapsed_seconds = int(time.time() - self.scan_start_time)
+                hours, remainder = divmod(elapsed_seconds, 3600)
+                minutes, seconds = divmod(remainder, 60)
+                if hours > 0:
+                    final_elapsed_time = f"{hours}h {minutes}m {seconds}s"
+                else:
+                    final_elapsed_time = f"{minutes}m {seconds}s"
+                self.scan_start_time = None  # Reset timer
+                self.last_scan_time_str = final_elapsed_time # Store for completion dialog
 
-                    # Hide scan interface after scanning completes and hide slim bar
-                    self.scan_group.hide()
-                    try:
-                        self.scan_status_bar.hide()
-                    except Exception:
-                        pass
+            # Update scan progress label
+            if valid_files == total_files:
+                self.label_scan_progress.setText(f"✓ {valid_files}/{total_files} files ready to remux")
+            else:
+                self.label_scan_progress.setText(f"⚠ {valid_files}/{total_files} files ready to remux")
 
-                    # Show remux interface after scanning completes
-                    self.progress_group.show()
-                    self.progress_group.setTitle("Remux")
-
-                    # Enable Start Remux button
-                    self.btn_start_remux.setEnabled(True)
-                    self.btn_start_remux.show()
-
-                    # Initialize remux interface with correct total file count
-                    self.label_total_progress.setText(f"Total Progress: 0/{total_files}")
-                    self.label_current_file.setText("Current file: None")
-                    self.label_status.setText("Ready")
-                    self.progress_bar_total.setValue(0)
-
-                    # Enable cancel button for safety
-                    self.btn_cancel.setEnabled(True)
-
-                    # Auto-start remuxing is now automatic
-
-                    self.log_text.append("Scan complete. Ready to remux.")
-
-                    # Re-enable source and output buttons after scan completes
-                    self.btn_browse_folder.setEnabled(True)
-                    self.btn_browse_files.setEnabled(True)
-                    self.btn_browse_output.setEnabled(True)
-                    self.btn_clear_output.setEnabled(True)
-
-                # --- Remux Messages ---
-                elif msg_type == "LOG":
-                    # Lightweight log mode: filter noisy/verbose lines unless debug is enabled
-                    message = str(data)
-
-                    if not self.debug_mode:
-                        m = message.strip()
-                        # Drop debug/verbose patterns
-                        if (
-                            m.startswith("[DEBUG]") or
-                            m.startswith("Detected Frame Rates") or
-                            (m.startswith("  - ") and not m.startswith("Frame rates:")) or
-                            (m.startswith("- ") and not m.startswith("Frame rates:")) or
-                            m.startswith("• ") and False or
-                            m.startswith("   -> [DEBUG]") or
-                            m.startswith("   -> Success") or
-                            (len(m) > 0 and set(m) == {"="})
-                        ):
-                            # Skip adding this line in simple mode
-                            return
-
-                    # Format log messages with timestamps for better readability
-                    from datetime import datetime
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    formatted_message = f"[{timestamp}] {message}"
-                    self.log_text.append(formatted_message)
-                    # Scroll to bottom
-                    scrollbar = self.log_text.verticalScrollBar()
-                    scrollbar.setValue(scrollbar.maximum())
-
-                elif msg_type == "STATUS":
-                    self.label_status.setText(data)
-
-                elif msg_type == "PROGRESS":
-                    self.progress_bar_total.setValue(int(data['total_percent']))
-                    self.label_total_progress.setText(f"Total Progress: {data['current']}/{data['total']}")
-
-                elif msg_type == "CURRENT_FILE":
-                    self.label_current_file.setText(f"Current file: {data['filename']}")
-
-                elif msg_type == "PARALLEL_STATUS":
-                    self.parallel_status_label.setText(data)
-
-                elif msg_type == "FINISHED":
-                    # Calculate elapsed time
-                    elapsed_time = None
-                    if self.processing_start_time:
-                        elapsed_seconds = time.time() - self.processing_start_time
-                        hours, remainder = divmod(int(elapsed_seconds), 3600)
-                        minutes, seconds = divmod(remainder, 60)
-                        if hours > 0:
-                            elapsed_time = f"{hours}h {minutes}m {seconds}s"
-                        else:
-                            elapsed_time = f"{minutes}m {seconds}s"
+            # Hide scan interface after scanning completes and hide slim bar
+            self.scan_group.hide()
+            try:
+                self.scan_status_bar.hide()
+            except Exception:
+                pass
 
-                    final_msg = f"Finished! Remuxed: {data['remuxed']}, Skipped: {data['skipped']}"
+            # Show remux interface after scanning completes
+            self.progress_group.show()
+            self.progress_group.setTitle("Remux")
 
-                    # Update the total progress label to show final count in same style as scan results
-                    total_processed = data['remuxed'] + data['skipped']
-                    total_files = len(self.files_to_process)
-                    if data['remuxed'] == total_files:
-                        self.label_total_progress.setText(f"✓ {data['remuxed']}/{total_files} files remuxed")
-                    else:
-                        self.label_total_progress.setText(f"✓ {data['remuxed']}/{total_files} files remuxed")
+            # Enable Start Remux button
+            self.btn_start_remux.setEnabled(True)
+            self.btn_start_remux.show()
 
-                    # Clear current activity labels since processing is complete
-                    self.label_current_file.setText("Current file: None")
-                    self.label_status.setText("Complete")
+            # Initialize remux interface with correct total file count
+            self.label_total_progress.setText(f"Total Progress: 0/{total_files}")
+            self.label_current_file.setText("Current file: None")
+            self.label_status.setText("Ready")
+            self.progress_bar_total.setValue(0)
 
-                    # The UI will be reset after the completion dialog is closed.
-                    self.log_text.append("Remux process completed successfully for all files.")
-                    self.show_completion_dialog(final_msg, data, elapsed_time, self.last_scan_time_str)
+            # Enable cancel button for safety
+            self.btn_cancel.setEnabled(True)
 
-        except queue.Empty:
-            pass
+            # Auto-start remuxing is now automatic
+
+            self.log_text.append("Scan complete. Ready to remux.")
+
+            # Re-enable source and output buttons after scan completes
+            self.set_source_buttons_enabled(True)
+
+        # --- Remux Messages ---
+        elif msg_type == "STATUS":
+            self.label_status.setText(data)
+
+        elif msg_type == "PROGRESS":
+            self.progress_bar_total.setValue(int(data['total_percent']))
+            self.label_total_progress.setText(f"Total Progress: {data['current']}/{data['total']}")
+
+        elif msg_type == "CURRENT_FILE":
+            self.label_current_file.setText(f"Current file: {data['filename']}")
+
+        elif msg_type == "PARALLEL_STATUS":
+            self.parallel_status_label.setText(data)
+
+        elif msg_type == "FINISHED":
+            # Calculate elapsed time
+            elapsed_time = None
+            if self.processing_start_time:
+                elapsed_seconds = time.time() - self.processing_start_time
+                hours, remainder = divmod(int(elapsed_seconds), 3600)
+                minutes, seconds = divmod(remainder, 60)
+                if hours > 0:
+                    elapsed_time = f"{hours}h {minutes}m {seconds}s"
+                else:
+                    elapsed_time = f"{minutes}m {seconds}s"
+
+            final_msg = f"Finished! Remuxed: {data['remuxed']}, Skipped: {data['skipped']}"
+
+            # Update the total progress label to show final count in same style as scan results
+            total_processed = data['remuxed'] + data['skipped']
+            total_files = len(self.files_to_process)
+            if data['remuxed'] == total_files:
+                self.label_total_progress.setText(f"✓ {data['remuxed']}/{total_files} files remuxed")
+            else:
+                self.label_total_progress.setText(f"✓ {data['remuxed']}/{total_files} files remuxed")
+
+            # Clear current activity labels since processing is complete
+            self.label_current_file.setText("Current file: None")
+            self.label_status.setText("Complete")
+
+            # The UI will be reset after the completion dialog is closed.
+            self.log_text.append("Remux process completed successfully for all files.")
+            self.show_completion_dialog(final_msg, data, elapsed_time, self.last_scan_time_str)
 
     # =============================================================================
     # UI STATE MANAGEMENT
@@ -1265,10 +1423,7 @@ class RemuxApp(QMainWindow):
         # Auto-start functionality is now automatic
 
         # Disable source and output buttons during scanning
-        self.btn_browse_folder.setEnabled(False)
-        self.btn_browse_files.setEnabled(False)
-        self.btn_browse_output.setEnabled(False)
-        self.btn_clear_output.setEnabled(False)
+        self.set_source_buttons_enabled(False)
 
         # Start the actual scanning in background
         self.start_scan_thread()
@@ -1304,10 +1459,7 @@ class RemuxApp(QMainWindow):
 
 
         # Re-enable source and output buttons when resetting scan state
-        self.btn_browse_folder.setEnabled(True)
-        self.btn_browse_files.setEnabled(True)
-        self.btn_browse_output.setEnabled(True)
-        self.btn_clear_output.setEnabled(True)
+        self.set_source_buttons_enabled(True)
 
         # Ensure settings are enabled after scan reset
         if not self.settings_disabled:
@@ -1315,7 +1467,12 @@ class RemuxApp(QMainWindow):
 
     def is_remuxer_running(self):
         """Check if the remuxer is currently running (scanning or remuxing)."""
-        return self.btn_start_remux.text() in ["Remuxing..."]
+        return self.is_remuxing
+
+    def set_source_buttons_enabled(self, enabled):
+        """Enable or disable the source and output selection buttons."""
+        for button in self.source_buttons:
+            button.setEnabled(enabled)
 
     def disable_settings_controls(self):
         """Disable all settings controls when remuxer is running to prevent changes."""
@@ -1341,6 +1498,7 @@ class RemuxApp(QMainWindow):
         self.btn_cancel.setEnabled(False)
         self.btn_start_remux.setEnabled(False)
         self.btn_start_remux.setText("Start Remux")
+        self.is_remuxing = False
 
         # Hide Start Remux button
         self.btn_start_remux.hide()
@@ -1376,20 +1534,19 @@ class RemuxApp(QMainWindow):
         directory = QFileDialog.getExistingDirectory(self, "Select Source Directory")
         if directory:
             # Consistent case handling for extensions
-            supported_extensions = [ext.lower() for ext in self.supported_formats['input']]
-            all_files = os.listdir(directory)
+            supported_extensions = self.supported_formats['input']
+            # scandir entries carry the joined path, so no per-file os.path.join is needed
+            with os.scandir(directory) as entries:
+                all_files = list(entries)
             self.files_to_process = [
-                os.path.join(directory, f)
-                for f in all_files
-                if any(f.lower().endswith(ext) for ext in supported_extensions)
+                entry.path
+                for entry in all_files
+                if entry.name.lower().endswith(supported_extensions)
             ]
-            format_counts = {}
-            for file in self.files_to_process:
-                ext = os.path.splitext(file)[1].lower()
-                format_counts[ext] = format_counts.get(ext, 0) + 1
-
             # DEBUG: Add logging to track file selection (only in debug mode)
             if self.debug_mode:
+                # Only the debug log uses per-extension counts, so only count them here
+                format_counts = Counter(os.path.splitext(file)[1].lower() for file in self.files_to_process)
                 self.log_text.append(f"[DEBUG] Selected directory: {directory}")
                 self.log_text.append(f"[DEBUG] Found {len(all_files)} total files in directory")
                 self.log_text.append(f"[DEBUG] Supported extensions: {supported_extensions}")
@@ -1407,9 +1564,7 @@ class RemuxApp(QMainWindow):
 
     def browse_input_files(self):
         """Browse for individual input files."""
-        filetypes = [("All supported", " ".join([f"*{ext}" for ext in self.supported_formats['input']]))]
-        filetypes.extend([(f"{ext.upper()} files", f"*{ext}") for ext in self.supported_formats['input']])
-        files, _ = QFileDialog.getOpenFileNames(self, "Select video files", "", ";;".join([f"{name} ({pattern})" for name, pattern in filetypes]))
+        files, _ = QFileDialog.getOpenFileNames(self, "Select video files", "", INPUT_FILE_DIALOG_FILTER)
         if files:
             self.files_to_process = list(files)
 
@@ -1449,19 +1604,18 @@ class RemuxApp(QMainWindow):
         if len(path) <= max_length:
             return path
 
-        # Split the path into components
-        parts = path.split('/')
-
-        if len(parts) <= 1:
-            return path
+        # Only the first two components and the last one are shown, so don't split the rest
+        parts = path.split('/', 2)
 
         # Simple approach: show drive + first folder + ... + last folder
         if len(parts) >= 2:
-            result = parts[0] + "/" + parts[1] + "/.../" + parts[-1]
-            return result
+            result = f"{parts[0]}/{parts[1]}/.../{path.rsplit('/', 1)[-1]}"
+            if len(result) <= max_length:
+                return result
 
-        # Fallback
-        return path
+        # Fallback for long folder names: keep both ends so the label stays one short line
+        keep = max_length - 3
+        return path[:keep // 2] + "..." + path[-(keep - keep // 2):]
 
     def clear_output_folder(self):
         """Clear the custom output folder and reset to 'Same as source'."""
@@ -1482,14 +1636,17 @@ class RemuxApp(QMainWindow):
         # After updating, trigger the auto-save
         self.auto_save_settings()
 
-    def update_file_action_setting(self):
+    def update_file_action_setting(self, button=None, checked=True):
         """Update the file_action setting when radio buttons change."""
+        if not checked:
+            return  # The group also reports the button being unchecked; act once on the new one
         if self.move_radio.isChecked():
             self.file_action = FILE_ACTION_MOVE
         elif self.keep_radio.isChecked():
             self.file_action = FILE_ACTION_KEEP
         elif self.delete_radio.isChecked():
             self.file_action = FILE_ACTION_DELETE
+        self.auto_save_settings()
 
     def update_timescale_setting(self):
         """Update the timescale settings when radio buttons change."""
@@ -1498,47 +1655,62 @@ class RemuxApp(QMainWindow):
     def update_output_format_setting(self, text):
         """Update the output_format setting when combo box changes."""
         self.output_format = text
+        self.auto_save_settings()
+
 
+    def notify_control_change(self):
+        """Wake worker threads waiting on a pause/cancel/skip change."""
+        with self.control_condition:
+            self.control_condition.notify_all()
+
+    def wait_for_control_signal(self, timeout=None):
+        """Block until processing is resumed, cancelled or skipped (or timeout expires)."""
+        with self.control_condition:
+            return self.control_condition.wait_for(
+                lambda: self.pause_event.is_set() or self.cancel_event.is_set() or self.skip_event.is_set(),
+                timeout
+            )
 
     def toggle_pause(self):
         """Toggle pause state."""
         if self.pause_event.is_set():
             self.pause_event.clear()
             self.btn_pause.setText("Resume")
-            self.process_queue.put(("LOG", "Remuxing paused."))
-            self.process_queue.put(("STATUS", "Paused..."))
+            self.process_queue.append(("LOG", "Remuxing paused."))
+            self.process_queue.append(("STATUS", "Paused..."))
         else:
             self.pause_event.set()
+            self.notify_control_change()
             self.btn_pause.setText("Pause")
-            self.process_queue.put(("LOG", "Remuxing resumed."))
-            self.process_queue.put(("STATUS", "Remuxing..."))
+            self.process_queue.append(("LOG", "Remuxing resumed."))
+            self.process_queue.append(("STATUS", "Remuxing..."))
 
     def skip_current_file(self):
         """Skip the currently processing file by moving to next in queue."""
+        self.process_queue.append(("LOG", "[SKIP] User requested skip - moving to next file"))
+
+        # Terminate current process immediately (only this part needs the lock)
         with self.process_lock:
-            self.process_queue.put(("LOG", "[SKIP] User requested skip - moving to next file"))
-            
-            # Terminate current process immediately
-            if hasattr(self, 'current_process') and self.current_process:
+            if self.current_process:
                 try:
                     self.current_process.terminate()
                     self.current_process.kill()  # Force kill immediately
                 except Exception:
                     pass
                 self.current_process = None
-            
-            # Set skip flag - this will be picked up by the processing loop
-            self.skip_event.set()
-            
-            # Show brief feedback but don't disable button
-            original_text = self.btn_skip.text()
-            self.btn_skip.setText("Skipping...")
-            
-            # Reset button text quickly but keep it enabled
-            QTimer.singleShot(300, lambda: self.btn_skip.setText(original_text))
-            
-            # Force UI update to ensure responsiveness
-            self.process_queue.put(("LOG", f"[DEBUG] Skip requested. Current file index: {getattr(self, 'current_file_index', 'unknown')}"))
+
+        # Set skip flag - this will be picked up by the processing loop
+        self.skip_event.set()
+        self.notify_control_change()
+
+        # Show brief feedback but don't disable button
+        self.btn_skip.setText("Skipping...")
+
+        # Reset button text quickly but keep it enabled
+        self.skip_feedback_timer.start()
+
+        # Force UI update to ensure responsiveness
+        self.process_queue.append(("LOG", f"[DEBUG] Skip requested. Current file index: {self.current_file_index}"))
 
     def force_kill_process(self):
         """Force kill the current process if it's still running."""
@@ -1584,9 +1756,10 @@ class RemuxApp(QMainWindow):
 
         if result == QMessageBox.Yes:
             self.cancel_event.set()
+            self.notify_control_change()
             with self.process_lock:
                 if self.current_process:
-                    self.process_queue.put(("LOG", "Sending termination signal to FFmpeg..."))
+                    self.process_queue.append(("LOG", "Sending termination signal to FFmpeg..."))
                     try:
                         self.current_process.terminate()
                     except Exception:
@@ -1594,23 +1767,23 @@ class RemuxApp(QMainWindow):
 
             # Reset UI to initial state
             self.reset_ui_after_processing()
-            self.process_queue.put(("LOG", "Operation cancelled and interface reset."))
+            self.process_queue.append(("LOG", "Operation cancelled and interface reset."))
 
             # Re-enable source and output buttons after cancellation
-            self.btn_browse_folder.setEnabled(True)
-            self.btn_browse_files.setEnabled(True)
-            self.btn_browse_output.setEnabled(True)
-            self.btn_clear_output.setEnabled(True)
+            self.set_source_buttons_enabled(True)
         else:
             # User clicked No, restore previous state
             if not was_paused:
                 self.pause_event.set()
-                self.process_queue.put(("LOG", "Resumed after cancel dialog."))
+                self.notify_control_change()
+                self.process_queue.append(("LOG", "Resumed after cancel dialog."))
 
     def closeEvent(self, event):
         """Handle application close event."""
-        # Save settings before closing
+        # Queue the final settings save (this also covers any pending debounced save);
+        # the writer thread saves it while the exit prompt and cleanup below run
         try:
+            self.settings_save_timer.stop()
             self.save_settings()
         except Exception as e:
             print(f"Failed to save settings on close: {e}")
@@ -1623,6 +1796,7 @@ class RemuxApp(QMainWindow):
                 return
 
             self.cancel_event.set()
+            self.notify_control_change()
             with self.process_lock:
                 if self.current_process:
                     try:
@@ -1630,10 +1804,17 @@ class RemuxApp(QMainWindow):
                     except Exception:
                         pass
 
-        # Check if we're in a post-completion state and need to reset
-        if self.is_scanned and not self.files_to_process:
-            # We're in a completed state, reset UI before closing
-            self.reset_ui_after_processing()
+            # The worker is a daemon thread: give it time to stop FFmpeg and delete the
+            # partial output, or a truncated file is left behind and skipped as existing next run
+            if self.remux_thread:
+                self.remux_thread.join(timeout=CLOSE_CLEANUP_TIMEOUT)
+
+        # The writer is a daemon thread, so give the final save a moment to finish before the app exits
+        try:
+            if not self.settings_write_done.wait(timeout=SETTINGS_CLOSE_TIMEOUT):
+                print("Settings are still being written; closing without waiting")
+        except Exception as e:
+            print(f"Failed to save settings on close: {e}")
 
         event.accept()
 
@@ -1850,11 +2031,11 @@ class RemuxApp(QMainWindow):
 
             if output_dir and os.path.exists(output_dir):
                 QDesktopServices.openUrl(QUrl.fromLocalFile(output_dir))
-                self.process_queue.put(("LOG", f"Opened output directory: {output_dir}"))
+                self.process_queue.append(("LOG", f"Opened output directory: {output_dir}"))
             else:
-                self.process_queue.put(("LOG", "Warning: Output directory not found or not specified"))
+                self.process_queue.append(("LOG", "Warning: Output directory not found or not specified"))
         except Exception as e:
-            self.process_queue.put(("LOG", f"Warning: Failed to open output directory: {str(e)}"))
+            self.process_queue.append(("LOG", f"Warning: Failed to open output directory: {str(e)}"))
 
     # =============================================================================
     # DRAG AND DROP HANDLERS
@@ -1872,12 +2053,12 @@ class RemuxApp(QMainWindow):
             return
 
         # Filter for local files with supported extensions
-        supported_extensions = [ext.lower() for ext in self.supported_formats['input']]
+        supported_extensions = self.supported_formats['input']
         dropped_files = []
         for url in urls:
             if url.isLocalFile():
                 file_path = url.toLocalFile()
-                if any(file_path.lower().endswith(ext) for ext in supported_extensions):
+                if file_path.lower().endswith(supported_extensions):
                     dropped_files.append(file_path)
 
         if not dropped_files:
@@ -1921,10 +2102,7 @@ class RemuxApp(QMainWindow):
         self.scan_start_time = time.time()
 
         # Disable source and output buttons during scanning
-        self.btn_browse_folder.setEnabled(False)
-        self.btn_browse_files.setEnabled(False)
-        self.btn_browse_output.setEnabled(False)
-        self.btn_clear_output.setEnabled(False)
+        self.set_source_buttons_enabled(False)
 
         # Scanning started automatically - no button to update
         self.log_text.clear()
@@ -1932,11 +2110,11 @@ class RemuxApp(QMainWindow):
         # Add session header to log
         from datetime import datetime
         session_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.process_queue.put(("LOG", "=" * 70))
-        self.process_queue.put(("LOG", f"SMARTREMUX LOG SESSION - {session_time}"))
-        self.process_queue.put(("LOG", "=" * 70))
+        self.process_queue.append(("LOG", LOG_SEPARATOR))
+        self.process_queue.append(("LOG", f"SMARTREMUX LOG SESSION - {session_time}"))
+        self.process_queue.append(("LOG", LOG_SEPARATOR))
 
-        threading.Thread(target=self.scan_files_worker, args=(list(self.files_to_process),), daemon=True).start()
+        threading.Thread(target=self.scan_files_worker, args=(tuple(self.files_to_process),), daemon=True).start()
 
 
     def start_remux_thread(self):
@@ -1961,13 +2139,11 @@ class RemuxApp(QMainWindow):
     def start_remuxing_process(self):
         """Start the actual remuxing process after preview (if enabled)."""
         # Disable source and output buttons during remuxing
-        self.btn_browse_folder.setEnabled(False)
-        self.btn_browse_files.setEnabled(False)
-        self.btn_browse_output.setEnabled(False)
-        self.btn_clear_output.setEnabled(False)
+        self.set_source_buttons_enabled(False)
 
         self.btn_start_remux.setEnabled(False)
         self.btn_start_remux.setText("Remuxing...")
+        self.is_remuxing = True
         self.btn_pause.setEnabled(True)
         self.btn_pause.setText("Pause")
         self.btn_skip.setEnabled(True)
@@ -1978,7 +2154,7 @@ class RemuxApp(QMainWindow):
 
 
         settings = {
-            "files": list(self.files_to_process),
+            "files": tuple(self.files_to_process),
             "output_dir": self.output_directory,
             "include_audio": self.include_audio,
             "file_action": self.file_action,
@@ -1992,26 +2168,29 @@ class RemuxApp(QMainWindow):
         # Record start time for elapsed time calculation
         self.processing_start_time = time.time()
 
-        self.process_queue.put(("LOG", "=" * 70))
-        self.process_queue.put(("LOG", f"Remux process started for {len(settings['files'])} files..."))
-        threading.Thread(target=self.remux_videos_worker, args=(settings,), daemon=True).start()
+        self.process_queue.append(("LOG", LOG_SEPARATOR))
+        self.process_queue.append(("LOG", f"Remux process started for {len(settings['files'])} files..."))
+        self.remux_thread = threading.Thread(target=self.remux_videos_worker, args=(settings,), daemon=True)
+        self.remux_thread.start()
         # Set initial status
-        self.process_queue.put(("STATUS", "Remuxing..."))
+        self.process_queue.append(("STATUS", "Remuxing..."))
 
     def scan_files_worker(self, files):
         """Scan multiple video files in parallel for improved performance."""
         results = {}
         total_files = len(files)
+        last_progress_emit = 0.0  # Scan progress is sent at a bounded rate, plus once at the end
 
         # DEBUG: Log scanning start (only in debug mode)
         if self.debug_mode:
-            self.process_queue.put(("LOG", f"[DEBUG] Starting scan of {total_files} files"))
-            self.process_queue.put(("LOG", f"[DEBUG] FFmpeg path: {self.ffmpeg_path}"))
-            self.process_queue.put(("LOG", f"[DEBUG] FFprobe path: {self.ffprobe_path}"))
-            self.process_queue.put(("LOG", f"[DEBUG] Validation enabled: {self.validate_files}"))
+            self.process_queue.append(("LOG", f"[DEBUG] Starting scan of {total_files} files"))
+            self.process_queue.append(("LOG", f"[DEBUG] FFmpeg path: {self.ffmpeg_path}"))
+            self.process_queue.append(("LOG", f"[DEBUG] FFprobe path: {self.ffprobe_path}"))
+            self.process_queue.append(("LOG", f"[DEBUG] Validation enabled: {self.validate_files}"))
 
-        # Use ThreadPoolExecutor for parallel scanning
-        max_workers = min(8, os.cpu_count() or 1) if total_files > 1 else 1
+        # Use ThreadPoolExecutor for parallel scanning. Probes spend their time waiting on
+        # ffprobe or disk reads (outside the GIL), so oversubscribe the cores.
+        max_workers = max(1, min(total_files, SCAN_MAX_WORKERS, (os.cpu_count() or 1) * SCAN_WORKERS_PER_CPU))
 
         try:
             with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -2021,7 +2200,8 @@ class RemuxApp(QMainWindow):
                     for file_path in files
                 }
 
-                # Process completed tasks
+                # Process completed tasks. Pool threads only return their results; this thread
+                # alone fills `results`, which the UI thread adopts on SCAN_COMPLETE.
                 completed_count = 0
                 for future in concurrent.futures.as_completed(future_to_file):
                     if self.cancel_event.is_set():
@@ -2043,15 +2223,17 @@ class RemuxApp(QMainWindow):
                         if self.debug_mode:
                             file_name = os.path.basename(file_path)
                             is_valid = result.get('valid', False)
-                            fps = result.get('fps', 'N/A')
+                            fps = self.get_fps_string(result) or 'N/A'
                             duration = result.get('duration', 0)
                             audio_tracks = result.get('audio_tracks', 0)
                             # Use a cleaner, formatted string for the log
-                            self.process_queue.put(("LOG", f"[DEBUG] Scanned {file_name}: valid={is_valid}, fps={fps}, duration={duration:.2f}s, audio={audio_tracks}"))
-                        # Batch progress updates to reduce UI overhead (every 5 files or at the end)
-                        if completed_count % 5 == 0 or completed_count == total_files:
+                            self.process_queue.append(("LOG", f"[DEBUG] Scanned {file_name}: valid={is_valid}, fps={fps}, duration={duration:.2f}s, audio={audio_tracks}"))
+                        # Batch progress updates to reduce UI overhead (time-based, and always at the end)
+                        now = time.monotonic()
+                        if completed_count == total_files or now - last_progress_emit >= SCAN_PROGRESS_INTERVAL:
+                            last_progress_emit = now
                             progress_percent = (completed_count / total_files) * 100
-                            self.process_queue.put(('SCAN_PROGRESS', {
+                            self.process_queue.append(('SCAN_PROGRESS', {
                                 'current': completed_count,
                                 'total': total_files,
                                 'percent': progress_percent
@@ -2059,24 +2241,26 @@ class RemuxApp(QMainWindow):
 
                     except Exception as e:
                         completed_count += 1
-                        results[file_path] = {'valid': False, 'fps': None, 'duration': 0}
-                        self.process_queue.put(("LOG", f"Warning: Error scanning {os.path.basename(file_path)}: {str(e)[:50]}"))
+                        results[file_path] = {'valid': False, 'fps_num': None, 'fps_den': None, 'duration': 0}
+                        self.process_queue.append(("LOG", f"Warning: Error scanning {os.path.basename(file_path)}: {str(e)[:50]}"))
 
                         # Batch progress updates
-                        if completed_count % 5 == 0 or completed_count == total_files:
+                        now = time.monotonic()
+                        if completed_count == total_files or now - last_progress_emit >= SCAN_PROGRESS_INTERVAL:
+                            last_progress_emit = now
                             progress_percent = (completed_count / total_files) * 100
-                            self.process_queue.put(('SCAN_PROGRESS', {
+                            self.process_queue.append(('SCAN_PROGRESS', {
                                 'current': completed_count,
                                 'total': total_files,
                                 'percent': progress_percent
                             }))
 
         except Exception as e:
-            self.process_queue.put(("LOG", f"Error in parallel scanning: {str(e)}"))
+            self.process_queue.append(("LOG", f"Error in parallel scanning: {str(e)}"))
             # Fallback to sequential processing for remaining files
             remaining_files = [f for f in files if f not in results]
             if remaining_files:
-                self.process_queue.put(("LOG", f"Falling back to sequential scanning for {len(remaining_files)} files..."))
+                self.process_queue.append(("LOG", f"Falling back to sequential scanning for {len(remaining_files)} files..."))
                 for i, file_path in enumerate(remaining_files):
                     if self.cancel_event.is_set():
                         break
@@ -2086,9 +2270,11 @@ class RemuxApp(QMainWindow):
                     completed_count = len(results)
 
                     # Batch progress updates
-                    if completed_count % 5 == 0 or completed_count == total_files:
+                    now = time.monotonic()
+                    if completed_count == total_files or now - last_progress_emit >= SCAN_PROGRESS_INTERVAL:
+                        last_progress_emit = now
                         progress_percent = (completed_count / total_files) * 100
-                        self.process_queue.put(('SCAN_PROGRESS', {
+                        self.process_queue.append(('SCAN_PROGRESS', {
                             'current': completed_count,
                             'total': total_files,
                             'percent': progress_percent
@@ -2098,33 +2284,24 @@ class RemuxApp(QMainWindow):
         if self.debug_mode:
             valid_count = sum(1 for r in results.values() if r.get('valid', False))
             invalid_count = len(results) - valid_count
-            self.process_queue.put(("LOG", f"[DEBUG] Scan complete: {valid_count} valid, {invalid_count} invalid files"))
-            self.process_queue.put(("LOG", f"[DEBUG] Total results: {len(results)}"))
+            self.process_queue.append(("LOG", f"[DEBUG] Scan complete: {valid_count} valid, {invalid_count} invalid files"))
+            self.process_queue.append(("LOG", f"[DEBUG] Total results: {len(results)}"))
 
         # Add a summary of validation if it was enabled
         if self.validate_files:
             valid_count = sum(1 for r in results.values() if r.get('valid', True))
             total_count = len(results)
-            self.process_queue.put(("LOG", f"Validated {valid_count}/{total_count} files successfully."))
+            self.process_queue.append(("LOG", f"Validated {valid_count}/{total_count} files successfully."))
 
         # --- ADDED: FPS Summary ---
-        fps_summary = {}
-        for result in results.values():
-            fps = result.get('fps')
-            if fps:
-                try:
-                    # Round to 3 decimal places to group similar FPS (e.g., 23.976)
-                    rounded_fps = f"{float(fps):.3f}".rstrip('0').rstrip('.')
-                    fps_summary[rounded_fps] = fps_summary.get(rounded_fps, 0) + 1
-                except (ValueError, TypeError):
-                    # Handle non-numeric FPS values if they somehow occur
-                    fps_summary[fps] = fps_summary.get(fps, 0) + 1
+        # Grouping keys are precomputed per file by scan_single_file
+        fps_summary = Counter(r['fps_key'] for r in results.values() if r.get('fps_key'))
 
         if fps_summary:
             # Mark verbose listing as debug
-            self.process_queue.put(("LOG", "[DEBUG] Detected Frame Rates:"))
+            self.process_queue.append(("LOG", "[DEBUG] Detected Frame Rates:"))
             for fps, count in fps_summary.items():
-                self.process_queue.put(("LOG", f"  - {fps} FPS: {count} file(s)"))
+                self.process_queue.append(("LOG", f"  - {fps} FPS: {count} file(s)"))
 
         # Add a concise, user-facing scan summary in normal mode
         try:
@@ -2132,64 +2309,47 @@ class RemuxApp(QMainWindow):
             valid_count = sum(1 for r in results.values() if r.get('valid', True))
             invalid_count = total_count - valid_count
             if self.validate_files:
-                self.process_queue.put(("LOG", f"Scanned {total_count} files: {valid_count} ready, {invalid_count} invalid"))
+                self.process_queue.append(("LOG", f"Scanned {total_count} files: {valid_count} ready, {invalid_count} invalid"))
             else:
-                self.process_queue.put(("LOG", f"Scanned {total_count} files"))
+                self.process_queue.append(("LOG", f"Scanned {total_count} files"))
 
             if fps_summary:
                 # Cleaner multi-line frame rate summary
-                self.process_queue.put(("LOG", "Frame rates:"))
+                self.process_queue.append(("LOG", "Frame rates:"))
                 for fps, count in sorted(fps_summary.items(), key=lambda item: float(item[0])):
-                    self.process_queue.put(("LOG", f"• {fps} ({count})"))
+                    self.process_queue.append(("LOG", f"• {fps} ({count})"))
         except Exception:
             pass
         # --- END ADDITION ---
 
-        self.process_queue.put(('SCAN_COMPLETE', {'results': results}))
+        # Persist newly probed files so the next scan of them skips probing
+        self.save_probe_cache()
+
+        self.process_queue.append(('SCAN_COMPLETE', {'results': results}))
 
     def scan_single_file(self, file_path):
         """Scan a single video file for metadata (used by parallel worker)."""
-        result = {'valid': True, 'fps': None, 'duration': 0}
+        # FPS is kept as a rational (fps_num/fps_den) and only formatted where it's used
+        result = {'valid': True, 'fps_num': None, 'fps_den': None, 'duration': 0}
         file_name = os.path.basename(file_path)
 
-        try:
-            # Get FPS first (separate call to ensure proper logging)
-            fps_command = [self.ffprobe_path, "-v", "error", "-select_streams", "v:0",
-                         "-show_entries", "stream=avg_frame_rate", "-of",
-                         "default=noprint_wrappers=1:nokey=1", file_path]
-
-            fps_process = subprocess.run(fps_command, capture_output=True, text=True, check=True, timeout=FPS_SCAN_TIMEOUT,
-                                        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0)
-
-            fps_fraction = fps_process.stdout.strip()
-            if '/' in fps_fraction and fps_fraction != "0/0":
-                num, den = map(int, fps_fraction.split('/'))
-                if den != 0:
-                    fps_value = num / den
-                    result['fps'] = str(fps_value)
-            elif fps_fraction and fps_fraction != "0/0":
-                try:
-                    fps_value = float(fps_fraction)
-                    result['fps'] = fps_fraction
-                except ValueError:
-                    pass
-
-            # Get duration and other info in a separate optimized call
-            duration_command = [self.ffprobe_path, "-v", "error", "-show_entries", "format=duration",
-                              "-of", "default=noprint_wrappers=1:nokey=1", file_path]
-
-            duration_process = subprocess.run(duration_command, capture_output=True, text=True, timeout=FFPROBE_TIMEOUT,
-                                            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0)
+        # The remux only needs ffprobe for the timescale option and validation; with both
+        # off, the cache and container header still fill in fps/duration/audio for free
+        need_ffprobe = self.use_timescale_option or self.validate_files
 
-            if duration_process.returncode == 0:
-                try:
-                    result['duration'] = float(duration_process.stdout.strip())
-                except ValueError:
-                    pass
+        try:
+            # Container header first, a single ffprobe call otherwise; cached on disk
+            probe = self.get_probe_info(file_path, use_ffprobe=need_ffprobe,
+                                        exact_fps=self.use_timescale_option)
+            if probe is None:
+                result['fps_key'] = None
+                return result
+            result['fps_num'] = probe['fps_num']
+            result['fps_den'] = probe['fps_den']
+            result['duration'] = probe['duration']
 
-            # Get audio track info if audio is included (separate call for detailed audio info)
             if self.include_audio:
-                audio_tracks = self.get_audio_track_info(file_path)
+                audio_tracks = probe['audio_tracks']
                 result['audio_tracks'] = len(audio_tracks)
                 if audio_tracks:
                     languages = [track['language'] for track in audio_tracks if track['language'] != 'und']
@@ -2199,22 +2359,215 @@ class RemuxApp(QMainWindow):
             # Only mark as invalid if validation is enabled
             if self.validate_files:
                 result['valid'] = False
-            self.process_queue.put(("LOG", f"Warning: Timeout scanning: {file_name}"))
+            self.process_queue.append(("LOG", f"Warning: Timeout scanning: {file_name}"))
         except Exception as e:
             # Only mark as invalid if validation is enabled
             if self.validate_files:
                 result['valid'] = False
-            self.process_queue.put(("LOG", f"Warning: Error scanning {file_name}: {str(e)}"))
+            self.process_queue.append(("LOG", f"Warning: Error scanning {file_name}: {str(e)}"))
 
         # Only log validation failures to reduce log spam
         if not result['valid']:
-            self.process_queue.put(("LOG", f"✗ Validation failed for {file_name}"))
+            self.process_queue.append(("LOG", f"✗ Validation failed for {file_name}"))
 
+        result['fps_key'] = self.get_fps_summary_key(result)
         return result
 
+    def get_probe_info(self, file_path, use_ffprobe=True, exact_fps=False):
+        """Return probe info for a file from the cache, its container header, or ffprobe.
+
+        With use_ffprobe off, returns None instead of spawning ffprobe on a header miss.
+        With exact_fps on, a frame rate from the capped fast probe is replaced by a full probe.
+        """
+        cache_key = self.get_probe_cache_key(file_path)
+        cached = self.lookup_probe_cache(cache_key)
+        if cached is not None:
+            if not (exact_fps and cached.get('fast_probe')):
+                return cached
+            # The fps will become -video_track_timescale, so don't trust the capped read
+            probe = self._probe_file(file_path, fast=False)
+            self.store_probe_cache(cache_key, probe)
+            return probe
+
+        probe = self.probe_container_headers(file_path)
+        if probe is None:
+            if not use_ffprobe:
+                return None
+            probe = self._probe_file(file_path, fast=not exact_fps)
+        self.store_probe_cache(cache_key, probe)
+        return probe
+
+    def get_fps_string(self, scan_result):
+        """Format a scan result's frame rate as a decimal string, or None if unknown."""
+        num, den = scan_result.get('fps_num'), scan_result.get('fps_den')
+        if not num or not den:
+            return None
+        return str(num / den)
+
+    def get_fps_summary_key(self, scan_result):
+        """Return the key used to group files by frame rate in the scan summary."""
+        num, den = scan_result.get('fps_num'), scan_result.get('fps_den')
+        if not num or not den:
+            return None
+        # Round to 3 decimal places to group similar FPS (e.g., 23.976)
+        return f"{num / den:.3f}".rstrip('0').rstrip('.')
+
+    # =============================================================================
+    # CONTAINER HEADER PARSING
+    # =============================================================================
+    def probe_container_headers(self, file_path):
+        """Read fps, duration and audio tracks directly from an MKV header.
+
+        Returns None when the container is not supported or the header can't be
+        parsed, so the caller can fall back to ffprobe.
+        """
+        ext = os.path.splitext(file_path)[1].lower()
+        try:
+            if ext in MKV_HEADER_EXTENSIONS:
+                info = self._probe_mkv(file_path)
+            else:
+                return None
+        except (OSError, EOFError, ValueError, IndexError, struct.error, ZeroDivisionError):
+            return None
+
+        # Without an fps value the timescale option can't be applied, so let ffprobe try
+        if not info or not info.get('fps_den'):
+            return None
+        info['has_video'] = True
+        return info
+
+    def _read_ebml_vint(self, stream, keep_marker=False):
+        """Read an EBML variable-length integer; returns (value, is_unknown_size)."""
+        first = stream.read(1)
+        if not first:
+            raise EOFError
+        first = first[0]
+        length = 1
+        mask = 0x80
+        while length <= 8 and not first & mask:
+            mask >>= 1
+            length += 1
+        if length > 8:
+            raise ValueError("Invalid EBML variable-length integer")
+
+        rest = stream.read(length - 1)
+        if len(rest) != length - 1:
+            raise EOFError
+        value = first if keep_marker else first & (mask - 1)
+        for byte in rest:
+            value = (value << 8) | byte
+
+        is_unknown = not keep_marker and value == (1 << (7 * length)) - 1
+        return value, is_unknown
+
+    def _read_ebml_elements(self, data):
+        """Yield (element_id, payload) for each child element in an EBML master payload."""
+        stream = io.BytesIO(data)
+        while True:
+            try:
+                element_id, _ = self._read_ebml_vint(stream, keep_marker=True)
+                size, _ = self._read_ebml_vint(stream)
+            except EOFError:
+                return
+            yield element_id, stream.read(size)
+
+    def _probe_mkv(self, file_path):
+        """Parse the Matroska Info and Tracks elements for fps, duration and audio tracks."""
+        info_data = None
+        tracks_data = None
+        with open(file_path, 'rb') as f:
+            # Skip the EBML header and descend into the Segment
+            element_id, _ = self._read_ebml_vint(f, keep_marker=True)
+            size, _ = self._read_ebml_vint(f)
+            f.seek(size, os.SEEK_CUR)
+            element_id, _ = self._read_ebml_vint(f, keep_marker=True)
+            if element_id != EBML_ID_SEGMENT:
+                return None
+            self._read_ebml_vint(f)
+
+            while info_data is None or tracks_data is None:
+                try:
+                    element_id, _ = self._read_ebml_vint(f, keep_marker=True)
+                    size, is_unknown = self._read_ebml_vint(f)
+                except EOFError:
+                    break
+                # Clusters (media data) follow the headers; stop before reading them
+                if element_id == EBML_ID_CLUSTER or is_unknown:
+                    break
+                if element_id == EBML_ID_INFO:
+                    info_data = f.read(size)
+                elif element_id == EBML_ID_TRACKS:
+                    tracks_data = f.read(size)
+                else:
+                    f.seek(size, os.SEEK_CUR)
+
+        if tracks_data is None:
+            return None
+
+        duration = 0
+        if info_data is not None:
+            timecode_scale = 1000000
+            raw_duration = None
+            for element_id, payload in self._read_ebml_elements(info_data):
+                if element_id == EBML_ID_TIMECODE_SCALE:
+                    timecode_scale = int.from_bytes(payload, 'big')
+                elif element_id == EBML_ID_DURATION:
+                    raw_duration = struct.unpack(">f" if len(payload) == 4 else ">d", payload)[0]
+            if raw_duration is not None:
+                duration = raw_duration * timecode_scale / 1e9
+
+        fps = None
+        audio_tracks = []
+        track_index = 0
+        for element_id, entry in self._read_ebml_elements(tracks_data):
+            if element_id != EBML_ID_TRACK_ENTRY:
+                continue
+            index = track_index
+            track_index += 1
+
+            track_type = None
+            codec_id = ""
+            language = "eng"  # Matroska default when the element is absent
+            default_duration = None
+            channels = "1"
+            for child_id, payload in self._read_ebml_elements(entry):
+                if child_id == EBML_ID_TRACK_TYPE:
+                    track_type = int.from_bytes(payload, 'big')
+                elif child_id == EBML_ID_CODEC_ID:
+                    codec_id = payload.rstrip(b'\x00').decode('ascii', 'replace')
+                elif child_id == EBML_ID_LANGUAGE:
+                    language = payload.rstrip(b'\x00').decode('ascii', 'replace')
+                elif child_id == EBML_ID_DEFAULT_DURATION:
+                    default_duration = int.from_bytes(payload, 'big')
+                elif child_id == EBML_ID_AUDIO:
+                    for audio_id, audio_payload in self._read_ebml_elements(payload):
+                        if audio_id == EBML_ID_CHANNELS:
+                            channels = str(int.from_bytes(audio_payload, 'big'))
+
+            if track_type == 1 and fps is None and default_duration:
+                # DefaultDuration is nanoseconds per frame; rounding the frame time keeps
+                # NTSC rates like 30000/1001 exact, matching ffprobe's avg_frame_rate
+                frame_time = Fraction(default_duration, 1000000000).limit_denominator(MKV_FPS_MAX_DENOMINATOR)
+                fps = 1 / frame_time
+            elif track_type == 2:
+                codec = codec_id[2:].split('/')[0].lower() if codec_id.startswith("A_") else codec_id.lower()
+                audio_tracks.append({
+                    'index': index,
+                    'codec': codec,
+                    'channels': channels,
+                    'language': language
+                })
+
+        return {
+            'fps_num': fps.numerator if fps else None,
+            'fps_den': fps.denominator if fps else None,
+            'duration': duration,
+            'audio_tracks': audio_tracks
+        }
+
     def remux_videos_worker(self, settings):
         """Process video files with simple queue-based skip functionality."""
-        self.file_queue = settings["files"][:] # Create a copy of the file list
+        self.file_queue = settings["files"]  # Immutable snapshot taken when the run started
         total_videos = len(self.file_queue)
         remuxed_count, skipped_count, error_count = 0, 0, 0
         
@@ -2222,7 +2575,7 @@ class RemuxApp(QMainWindow):
         
         while self.current_file_index < len(self.file_queue):
             if self.cancel_event.is_set():
-                self.process_queue.put(("LOG", "Operation cancelled by user."))
+                self.process_queue.append(("LOG", "Operation cancelled by user."))
                 break
             
             # Determine current file and info up front so we can update UI even while paused
@@ -2231,55 +2584,53 @@ class RemuxApp(QMainWindow):
             scan_result = settings["scan_results"].get(video_file_path, {})
             duration = scan_result.get('duration', 0)
             # Prepare output paths early so we can handle MOVE action even on pre-start or paused skips
-            output_dir_final = settings["output_dir"] or os.path.dirname(video_file_path)
-            output_file_path = os.path.join(output_dir_final, os.path.splitext(file_name)[0] + settings["output_format"])
+            output_file_path = self.get_output_file_path(video_file_path, settings)
 
             # Update UI for the current file immediately
-            self.process_queue.put(("LOG", f"Processing file {self.current_file_index + 1}/{total_videos}: {file_name}"))
-            self.process_queue.put(("PROGRESS", {'total_percent': (self.current_file_index / total_videos) * 100, 'current': self.current_file_index, 'total': total_videos}))
-            self.process_queue.put(("CURRENT_FILE", {'filename': file_name, 'duration': duration}))
+            self.process_queue.append(("LOG", f"Processing file {self.current_file_index + 1}/{total_videos}: {file_name}"))
+            self.process_queue.append(("PROGRESS", {'total_percent': (self.current_file_index / total_videos) * 100, 'current': self.current_file_index, 'total': total_videos}))
+            self.process_queue.append(("CURRENT_FILE", {'filename': file_name, 'duration': duration}))
 
             # If paused, allow unlimited skipping without starting the process
             if not self.pause_event.is_set():
                 while not self.pause_event.is_set():
                     if self.cancel_event.is_set():
-                        self.process_queue.put(("LOG", "Operation cancelled by user."))
+                        self.process_queue.append(("LOG", "Operation cancelled by user."))
                         break
                     if self.skip_event.is_set():
                         # Handle skip while paused: advance to next file and update UI/progress
                         self.skip_event.clear()
                         skipped_count += 1
-                        self.process_queue.put(("LOG", f"[SKIP] Skipped while paused: {file_name}"))
+                        self.process_queue.append(("LOG", f"[SKIP] Skipped while paused: {file_name}"))
                         # Move original if configured to do so, even on skip
                         if settings.get("file_action") == FILE_ACTION_MOVE:
                             try:
-                                self.handle_original_file(file_name, output_file_path, settings)
+                                self.handle_original_file(video_file_path, output_file_path, settings)
                             except Exception as _e:
-                                self.process_queue.put(("LOG", f"   -> WARNING: Failed moving original on skip: {_e}"))
+                                self.process_queue.append(("LOG", f"   -> WARNING: Failed moving original on skip: {_e}"))
                         self.current_file_index += 1
 
                         # Update progress and current file label for the next item
                         current_processed = self.current_file_index
-                        self.process_queue.put(("PROGRESS", {'total_percent': (current_processed / total_videos) * 100, 'current': current_processed, 'total': total_videos}))
+                        self.process_queue.append(("PROGRESS", {'total_percent': (current_processed / total_videos) * 100, 'current': current_processed, 'total': total_videos}))
                         if self.current_file_index < len(self.file_queue):
                             next_video_file_path = self.file_queue[self.current_file_index]
                             next_file_name = os.path.basename(next_video_file_path)
                             next_scan_result = settings["scan_results"].get(next_video_file_path, {})
                             next_duration = next_scan_result.get('duration', 0)
-                            self.process_queue.put(("CURRENT_FILE", {'filename': next_file_name, 'duration': next_duration}))
+                            self.process_queue.append(("CURRENT_FILE", {'filename': next_file_name, 'duration': next_duration}))
                             # Update local context for handling multiple rapid skips while paused
                             video_file_path = next_video_file_path
                             file_name = next_file_name
                             scan_result = next_scan_result
                             duration = next_duration
                             # Recompute output paths for the new current file
-                            output_dir_final = settings["output_dir"] or os.path.dirname(video_file_path)
-                            output_file_path = os.path.join(output_dir_final, os.path.splitext(file_name)[0] + settings["output_format"])
+                            output_file_path = self.get_output_file_path(video_file_path, settings)
                         else:
-                            self.process_queue.put(("CURRENT_FILE", {'filename': 'Processing Complete', 'duration': 0}))
+                            self.process_queue.append(("CURRENT_FILE", {'filename': 'Processing Complete', 'duration': 0}))
                             break
                     else:
-                        time.sleep(0.1)
+                        self.wait_for_control_signal(timeout=0.5)
 
                 # If cancelled during pause, stop
                 if self.cancel_event.is_set():
@@ -2293,34 +2644,34 @@ class RemuxApp(QMainWindow):
             if self.skip_event.is_set():
                 self.skip_event.clear()
                 skipped_count += 1
-                self.process_queue.put(("LOG", f"[SKIP] Skipped before starting: {file_name}"))
+                self.process_queue.append(("LOG", f"[SKIP] Skipped before starting: {file_name}"))
                 # Move original if configured to do so, even on skip
                 if settings.get("file_action") == FILE_ACTION_MOVE:
                     try:
-                        self.handle_original_file(file_name, output_file_path, settings)
+                        self.handle_original_file(video_file_path, output_file_path, settings)
                     except Exception as _e:
-                        self.process_queue.put(("LOG", f"   -> WARNING: Failed moving original on skip: {_e}"))
+                        self.process_queue.append(("LOG", f"   -> WARNING: Failed moving original on skip: {_e}"))
                 self.current_file_index += 1
 
                 # Update progress and set the next current file immediately
                 current_processed = self.current_file_index
-                self.process_queue.put(("PROGRESS", {'total_percent': (current_processed / total_videos) * 100, 'current': current_processed, 'total': total_videos}))
+                self.process_queue.append(("PROGRESS", {'total_percent': (current_processed / total_videos) * 100, 'current': current_processed, 'total': total_videos}))
                 if self.current_file_index < len(self.file_queue):
                     next_video_file_path = self.file_queue[self.current_file_index]
                     next_file_name = os.path.basename(next_video_file_path)
                     next_scan_result = settings["scan_results"].get(next_video_file_path, {})
                     next_duration = next_scan_result.get('duration', 0)
-                    self.process_queue.put(("CURRENT_FILE", {'filename': next_file_name, 'duration': next_duration}))
+                    self.process_queue.append(("CURRENT_FILE", {'filename': next_file_name, 'duration': next_duration}))
                 else:
-                    self.process_queue.put(("CURRENT_FILE", {'filename': 'Processing Complete', 'duration': 0}))
+                    self.process_queue.append(("CURRENT_FILE", {'filename': 'Processing Complete', 'duration': 0}))
                 continue
 
             # Re-enable skip button for each file
-            self.process_queue.put(("SKIP_BUTTON_RESET", None))
+            self.process_queue.append(("SKIP_BUTTON_RESET", None))
 
             # Check if file is valid
             if not scan_result.get('valid', True):
-                self.process_queue.put(("LOG", f"Skipping invalid file: {file_name}"))
+                self.process_queue.append(("LOG", f"Skipping invalid file: {file_name}"))
                 skipped_count += 1
                 self.current_file_index += 1
                 continue
@@ -2335,19 +2686,19 @@ class RemuxApp(QMainWindow):
             if result == "error":
                 error_count += 1
                 skipped_count += 1
-                self.process_queue.put(("LOG", f"[DEBUG] File error: {file_name}"))
+                self.process_queue.append(("LOG", f"[DEBUG] File error: {file_name}"))
             elif result == "completed":
                 remuxed_count += 1
-                self.process_queue.put(("LOG", f"[DEBUG] File completed: {file_name}"))
+                self.process_queue.append(("LOG", f"[DEBUG] File completed: {file_name}"))
             elif result == "skipped":
                 skipped_count += 1
-                self.process_queue.put(("LOG", f"[DEBUG] File skipped: {file_name}"))
+                self.process_queue.append(("LOG", f"[DEBUG] File skipped: {file_name}"))
                 # Move original if configured to do so on skip after process started or output existed
                 if settings.get("file_action") == FILE_ACTION_MOVE:
                     try:
-                        self.handle_original_file(file_name, output_file_path, settings)
+                        self.handle_original_file(video_file_path, output_file_path, settings)
                     except Exception as _e:
-                        self.process_queue.put(("LOG", f"   -> WARNING: Failed moving original on skip: {_e}"))
+                        self.process_queue.append(("LOG", f"   -> WARNING: Failed moving original on skip: {_e}"))
             elif result == "cancelled":
                 break
                 
@@ -2356,7 +2707,7 @@ class RemuxApp(QMainWindow):
             
             # Update progress immediately after processing each file
             current_processed = self.current_file_index
-            self.process_queue.put(("PROGRESS", {'total_percent': (current_processed / total_videos) * 100, 'current': current_processed, 'total': total_videos}))
+            self.process_queue.append(("PROGRESS", {'total_percent': (current_processed / total_videos) * 100, 'current': current_processed, 'total': total_videos}))
             
             # Update UI to show next file if there are more files
             if self.current_file_index < len(self.file_queue):
@@ -2365,149 +2716,105 @@ class RemuxApp(QMainWindow):
                 next_scan_result = settings["scan_results"].get(next_video_file_path, {})
                 next_duration = next_scan_result.get('duration', 0)
                 
-                self.process_queue.put(("CURRENT_FILE", {'filename': next_file_name, 'duration': next_duration}))
-                self.process_queue.put(("LOG", f"[DEBUG] UI updated for next file: {next_file_name}"))
+                self.process_queue.append(("CURRENT_FILE", {'filename': next_file_name, 'duration': next_duration}))
+                self.process_queue.append(("LOG", f"[DEBUG] UI updated for next file: {next_file_name}"))
             else:
-                self.process_queue.put(("CURRENT_FILE", {'filename': 'Processing Complete', 'duration': 0}))
-                self.process_queue.put(("LOG", f"[DEBUG] All files processed. Queue complete."))
+                self.process_queue.append(("CURRENT_FILE", {'filename': 'Processing Complete', 'duration': 0}))
+                self.process_queue.append(("LOG", f"[DEBUG] All files processed. Queue complete."))
         
-        self.process_queue.put(("PROGRESS", {'total_percent': 100, 'current': total_videos, 'total': total_videos}))
-        self.process_queue.put(("FINISHED", {'remuxed': remuxed_count, 'skipped': skipped_count}))
+        self.process_queue.append(("PROGRESS", {'total_percent': 100, 'current': total_videos, 'total': total_videos}))
+        self.process_queue.append(("FINISHED", {'remuxed': remuxed_count, 'skipped': skipped_count}))
 
     def execute_ffmpeg_process(self, command, output_file_path, file_name, duration, settings, source_file_path):
         """Execute FFmpeg process with real-time output reading to prevent freezing."""
         # --- Consolidated Pre-check and Logging ---
         if os.path.exists(output_file_path):
             if settings.get("overwrite_existing", False):
-                self.process_queue.put(("LOG", f"Remuxing: {file_name} (Overwriting existing)"))
+                self.process_queue.append(("LOG", f"Remuxing: {file_name} (Overwriting existing)"))
             else:
-                self.process_queue.put(("LOG", f"Skipping: {file_name} (Output file already exists)"))
+                self.process_queue.append(("LOG", f"Skipping: {file_name} (Output file already exists)"))
                 return "skipped"
         else:
-            self.process_queue.put(("LOG", f"Remuxing: {file_name}"))
+            self.process_queue.append(("LOG", f"Remuxing: {file_name}"))
         # --- End Consolidation ---
 
+        watchdog = None
         try:
-            # self.process_queue.put(("LOG", f""))
-            # self.process_queue.put(("LOG", f"{'='*60}"))
-            # self.process_queue.put(("LOG", f"[PROCESSING] {file_name}"))
-            # self.process_queue.put(("LOG", f"{'='*60}"))
-
             # Run the command with real-time output reading
             process = subprocess.Popen(
                 command,
+                stdin=subprocess.DEVNULL,  # No keyboard interaction; nothing inherited from the GUI
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,  # Combine stdout and stderr
-                universal_newlines=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+                creationflags=SUBPROCESS_CREATION_FLAGS
             )
 
             # Store process reference for skip functionality
             with self.process_lock:
                 self.current_process = process
 
+            # A stalled input (e.g. an unreachable network share) would block the reads below forever.
+            # Only running time counts: the watchdog is stopped while paused and rearmed on resume.
+            timed_out = threading.Event()
+            time_left = PROCESS_TIMEOUT
+            watchdog = self.start_ffmpeg_watchdog(process, timed_out, time_left)
+            watchdog_started = time.monotonic()
+
             # Throttle FFmpeg progress log emission to avoid UI flooding
             last_ffmpeg_emit = 0.0
             emit_interval = 0.5 if not self.debug_mode else 0.1
+            output_lines = self.iter_output_lines(process.stdout)
+            progress = {}  # Latest value of each -progress key
 
             # Read output line by line to prevent freezing
             while True:
                 # Check for skip - immediate return if skip requested
                 if self.skip_event.is_set():
-                    # Clear skip event immediately to allow next skip
-                    self.skip_event.clear()
-                    
-                    self.process_queue.put(("LOG", f"[SKIP] Skipping {file_name} - moving to next file"))
-                    
-                    # Re-enable skip button immediately
-                    self.process_queue.put(("SKIP_BUTTON_RESET", None))
-                    
-                    process.terminate()
-                    try:
-                        process.kill()
-                    except Exception:
-                        pass
-                    
-                    # Clean up output file
-                    try:
-                        if os.path.exists(output_file_path):
-                            os.remove(output_file_path)
-                    except Exception:
-                        pass
-                    
-                    # Clear process reference
-                    with self.process_lock:
-                        self.current_process = None
-                    
-                    return "skipped"
+                    return self.stop_ffmpeg_for_skip(process, output_file_path, file_name)
 
                 # Check for cancel event
                 if self.cancel_event.is_set():
-                    process.terminate()
-                    try:
-                        process.wait(timeout=2)
-                    except subprocess.TimeoutExpired:
-                        process.kill()
-                        process.wait()
-                    
-                    try:
-                        if os.path.exists(output_file_path):
-                            os.remove(output_file_path)
-                    except Exception:
-                        pass
-                    
-                    with self.process_lock:
-                        self.current_process = None
-                    return "cancelled"
+                    return self.stop_ffmpeg_for_cancel(process, output_file_path)
 
                 # Check for pause event - this makes pause responsive during file processing
                 if not self.pause_event.is_set():
+                    watchdog.cancel()
+                    time_left -= time.monotonic() - watchdog_started
+
                     # Pause requested - wait for resume or other events
-                    while not self.pause_event.is_set() and not self.cancel_event.is_set() and not self.skip_event.is_set():
-                        time.sleep(0.1)  # Small delay to prevent busy waiting
+                    while not self.wait_for_control_signal(timeout=0.5):
+                        pass
 
-                    # If cancelled or skipped while paused, handle accordingly
+                    # Cancel while paused wins over a pending skip
                     if self.cancel_event.is_set():
-                        process.terminate()
-                        try:
-                            process.wait(timeout=2)
-                        except subprocess.TimeoutExpired:
-                            process.kill()
-                            process.wait()
-                        
-                        try:
-                            if os.path.exists(output_file_path):
-                                os.remove(output_file_path)
-                        except Exception:
-                            pass
-                        
-                        with self.process_lock:
-                            self.current_process = None
-                        return "cancelled"
+                        return self.stop_ffmpeg_for_cancel(process, output_file_path)
 
-                    # Check for skip during pause
-                    if self.skip_event.is_set():
-                        # Skip requested while paused - handle it
-                        continue
+                    watchdog = self.start_ffmpeg_watchdog(process, timed_out, time_left)
+                    watchdog_started = time.monotonic()
 
-                    # If we get here, pause was lifted, continue processing
+                    # Resumed or skipped: the checks at the top of the loop take it from here
                     continue
 
                 # Read output line by line to prevent buffer overflow and freezing
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
+                output = next(output_lines, None)
+                if output is None:
                     break
 
-                if output:
-                    # Log FFmpeg output with detailed information but less frequently
-                    stripped_output = output.strip()
-                    if stripped_output:
-                        # Show FFmpeg progress stats by default with a small throttle
-                        if any(keyword in stripped_output for keyword in ['time=', 'frame=', 'size=', 'fps=', 'bitrate=', 'speed=']):
-                            now = time.time()
-                            if now - last_ffmpeg_emit >= emit_interval:
-                                self.process_queue.put(("LOG", f"   [FFMPEG] {stripped_output}"))
-                                last_ffmpeg_emit = now
+                # Collect -progress key=value pairs; a "progress" key closes each block
+                match = FFMPEG_PROGRESS_PATTERN.fullmatch(output)
+                if not match:
+                    continue
+                key, value = match.groups()
+                if key != b"progress":
+                    progress[key] = value.strip()
+                    continue
+
+                # Show FFmpeg progress stats by default with a small throttle (the final block always)
+                now = time.time()
+                if now - last_ffmpeg_emit >= emit_interval or value == b"end":
+                    stats = b" ".join(k + b"=" + progress[k] for k in FFMPEG_PROGRESS_LOG_KEYS if k in progress)
+                    self.process_queue.append(("LOG", f"   [FFMPEG] {stats.decode('utf-8', 'replace')}"))
+                    last_ffmpeg_emit = now
 
             # Wait for process to complete
             process.wait()
@@ -2517,209 +2824,246 @@ class RemuxApp(QMainWindow):
                 self.current_process = None
 
             # Re-enable skip button for next file
-            self.process_queue.put(("SKIP_BUTTON_RESET", None))
+            self.process_queue.append(("SKIP_BUTTON_RESET", None))
 
             if self.cancel_event.is_set():
-                try:
-                    if os.path.exists(output_file_path):
-                        os.remove(output_file_path)
-                except Exception:
-                    pass
+                self.remove_partial_output(output_file_path)
                 return "cancelled"
 
+            if timed_out.is_set():
+                self.remove_partial_output(output_file_path)
+                self.process_queue.append(("LOG", f"   -> ERROR: Failed remuxing {file_name}. Timed out after {PROCESS_TIMEOUT} seconds"))
+                return "error"
+
             if process.returncode == 0:
-                self.process_queue.put(("LOG", f"   -> Success"))
+                self.process_queue.append(("LOG", f"   -> Success"))
 
                 # Preserve original file timestamps if option is enabled
                 if settings.get("preserve_timestamps", False):
                     # Use the original source file path that was passed to this function
                     # DEBUG: Log the paths being used for timestamp preservation
                     if self.debug_mode:
-                        self.process_queue.put(("LOG", f"   [DEBUG] Attempting timestamp preservation"))
-                        self.process_queue.put(("LOG", f"   [DEBUG] Source file path: {source_file_path}"))
-                        self.process_queue.put(("LOG", f"   [DEBUG] Target file path: {output_file_path}"))
-                        self.process_queue.put(("LOG", f"   [DEBUG] Source file exists: {os.path.exists(source_file_path)}"))
-                        self.process_queue.put(("LOG", f"   [DEBUG] Target file exists: {os.path.exists(output_file_path)}"))
+                        self.process_queue.append(("LOG", f"   [DEBUG] Attempting timestamp preservation"))
+                        self.process_queue.append(("LOG", f"   [DEBUG] Source file path: {source_file_path}"))
+                        self.process_queue.append(("LOG", f"   [DEBUG] Target file path: {output_file_path}"))
+                        self.process_queue.append(("LOG", f"   [DEBUG] Source file exists: {os.path.exists(source_file_path)}"))
+                        self.process_queue.append(("LOG", f"   [DEBUG] Target file exists: {os.path.exists(output_file_path)}"))
                     if self.preserve_file_timestamps(source_file_path, output_file_path):
                         if self.debug_mode:
-                            self.process_queue.put(("LOG", f"   -> [DEBUG] Timestamps preserved"))
+                            self.process_queue.append(("LOG", f"   -> [DEBUG] Timestamps preserved"))
                     else:
-                        self.process_queue.put(("LOG", f"   -> WARNING: Failed to preserve timestamps"))
+                        self.process_queue.append(("LOG", f"   -> WARNING: Failed to preserve timestamps"))
 
                 # Handle original file
-                self.handle_original_file(file_name, output_file_path, settings)
+                self.handle_original_file(source_file_path, output_file_path, settings)
                 return "completed"
             else:
-                self.process_queue.put(("LOG", f"   -> ERROR: Failed remuxing {file_name}. Return code: {process.returncode}"))
+                self.process_queue.append(("LOG", f"   -> ERROR: Failed remuxing {file_name}. Return code: {process.returncode}"))
                 return "error"
 
         except Exception as e:
-            self.process_queue.put(("LOG", f"   -> CRITICAL ERROR: {e}"))
+            self.process_queue.append(("LOG", f"   -> CRITICAL ERROR: {e}"))
             with self.process_lock:
                 self.current_process = None
             # Re-enable skip button for next file
-            self.process_queue.put(("SKIP_BUTTON_RESET", None))
+            self.process_queue.append(("SKIP_BUTTON_RESET", None))
             return "error"
+        finally:
+            if watchdog:
+                watchdog.cancel()
+
+    def start_ffmpeg_watchdog(self, process, timed_out, timeout):
+        """Start a timer that kills FFmpeg after `timeout` seconds unless cancelled first."""
+        watchdog = threading.Timer(timeout, self.kill_timed_out_ffmpeg, args=(process, timed_out))
+        watchdog.daemon = True
+        watchdog.start()
+        return watchdog
+
+    def kill_timed_out_ffmpeg(self, process, timed_out):
+        """Watchdog callback: kill an FFmpeg run that exceeded PROCESS_TIMEOUT."""
+        timed_out.set()
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+    def stop_ffmpeg_for_skip(self, process, output_file_path, file_name):
+        """Kill FFmpeg for a user skip and clean up its partial output."""
+        # Clear skip event immediately to allow next skip
+        self.skip_event.clear()
+        self.process_queue.append(("LOG", f"[SKIP] Skipping {file_name} - moving to next file"))
+
+        # Re-enable skip button immediately
+        self.process_queue.append(("SKIP_BUTTON_RESET", None))
+
+        process.terminate()
+        try:
+            process.kill()
+        except Exception:
+            pass
+
+        self.remove_partial_output(output_file_path)
+        with self.process_lock:
+            self.current_process = None
+        return "skipped"
+
+    def stop_ffmpeg_for_cancel(self, process, output_file_path):
+        """Stop FFmpeg for a cancel (gracefully, then forcibly) and clean up its partial output."""
+        process.terminate()
+        try:
+            process.wait(timeout=FFMPEG_STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+        self.remove_partial_output(output_file_path)
+        with self.process_lock:
+            self.current_process = None
+        return "cancelled"
+
+    def remove_partial_output(self, output_file_path):
+        """Delete an unfinished output file; a file that was never created is fine."""
+        try:
+            os.remove(output_file_path)
+        except OSError:
+            pass
+
+    def iter_output_lines(self, stream):
+        """Yield non-empty lines from a binary pipe, splitting on carriage returns and newlines."""
+        pending = b''
+        while True:
+            chunk = stream.read1(FFMPEG_READ_CHUNK_SIZE)
+            if not chunk:
+                if pending:
+                    yield pending
+                return
+            lines = FFMPEG_LINE_BREAK_PATTERN.split(pending + chunk)
+            pending = lines.pop()
+            for line in lines:
+                if line:
+                    yield line
 
     def preserve_file_timestamps(self, source_file, target_file):
         """Copy timestamps from source file to target file."""
         try:
             # Get timestamps from source file
             stat_info = os.stat(source_file)
-            access_time = stat_info.st_atime
-            modify_time = stat_info.st_mtime
 
-            # Apply timestamps to target file
-            os.utime(target_file, (access_time, modify_time))
+            # Apply timestamps to target file (integer nanoseconds, no float round-trip)
+            os.utime(target_file, ns=(stat_info.st_atime_ns, stat_info.st_mtime_ns))
             return True
         except Exception as e:
-            self.process_queue.put(("LOG", f"Warning: Failed to preserve timestamps: {str(e)}"))
+            self.process_queue.append(("LOG", f"Warning: Failed to preserve timestamps: {str(e)}"))
             return False
 
-    def handle_original_file(self, file_name, output_file_path, settings):
+    def handle_original_file(self, source_file_path, output_file_path, settings):
         """Handle the original file based on the file action setting."""
         action = settings["file_action"]
+        file_name = os.path.basename(source_file_path)
+        source_dir = os.path.dirname(source_file_path)
         try:
             if action == FILE_ACTION_MOVE:
                 # Move to subfolder - always in source directory, not output directory
-                # Find the source directory by looking through files_to_process
-                source_dir = None
-                for file_path in settings.get("files", []):
-                    if os.path.basename(file_path) == file_name:
-                        source_dir = os.path.dirname(file_path)
-                        break
-
-                if source_dir:
-                    original_ext = os.path.splitext(file_name)[1].upper()[1:]
-                    subfolder = os.path.join(source_dir, "Remuxed")
-                    os.makedirs(subfolder, exist_ok=True)
-                    shutil.move(os.path.join(source_dir, file_name), os.path.join(subfolder, file_name))
-                    if self.debug_mode:
-                        self.process_queue.put(("LOG", f"   -> [DEBUG] Original moved to 'Remuxed' folder"))
-                else:
-                    self.process_queue.put(("LOG", f"   -> WARNING: Could not find source directory for {file_name}"))
+                subfolder = os.path.join(source_dir, "Remuxed")
+                os.makedirs(subfolder, exist_ok=True)
+                shutil.move(source_file_path, os.path.join(subfolder, file_name))
+                if self.debug_mode:
+                    self.process_queue.append(("LOG", f"   -> [DEBUG] Original moved to 'Remuxed' folder"))
             elif action == FILE_ACTION_DELETE:
-                # Find the source directory for deletion
-                source_dir = None
-                for file_path in settings.get("files", []):
-                    if os.path.basename(file_path) == file_name:
-                        source_dir = os.path.dirname(file_path)
-                        break
-
-                if source_dir:
-                    os.remove(os.path.join(source_dir, file_name))
-                    if self.debug_mode:
-                        self.process_queue.put(("LOG", f"   -> [DEBUG] Original file deleted"))
-                else:
-                    self.process_queue.put(("LOG", f"   -> WARNING: Could not find source directory for {file_name}"))
+                os.remove(source_file_path)
+                if self.debug_mode:
+                    self.process_queue.append(("LOG", f"   -> [DEBUG] Original file deleted"))
         except Exception as e:
-            self.process_queue.put(("LOG", f"   -> WARNING: Failed to handle original file: {str(e)}"))
+            self.process_queue.append(("LOG", f"   -> WARNING: Failed to handle original file: {str(e)}"))
+
+    def _probe_file(self, file_path, fast=True):
+        """Run a single ffprobe call and return fps, duration, audio tracks and video presence.
+
+        The fast probe caps how much of the file ffprobe reads; if it fails, reports no streams
+        or can't find a video stream with a frame rate, the file is probed again with ffprobe's
+        default limits. Results from the capped read are flagged with 'fast_probe' so an
+        approximate frame rate isn't later used as the timescale.
+        """
+        command = [self.ffprobe_path, "-v", "error"]
+        if fast:
+            command += FFPROBE_FAST_ARGS
+        command += FFPROBE_ENTRY_ARGS
+        command.append(file_path)
 
-    def get_audio_track_info(self, file_path):
-        """Get information about audio tracks in the file."""
         try:
-            command = [self.ffprobe_path, "-v", "error", "-select_streams", "a",
-                       "-show_entries", "stream=index,codec_name,channels,language",
-                       "-of", "csv=p=0", file_path]
-
-            result = subprocess.run(command, capture_output=True, text=True, timeout=FFPROBE_TIMEOUT,
-                                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0)
-
-            if result.returncode == 0:
-                tracks = []
-                for line in result.stdout.strip().split('\n'):
-                    if line:
-                        parts = line.split(',')
-                        if len(parts) >= 3:
-                            index, codec, channels = parts[0], parts[1], parts[2]
-                            language = parts[3] if len(parts) > 3 and parts[3] else "und"
-                            tracks.append({
-                                'index': int(index),
-                                'codec': codec,
-                                'channels': channels,
-                                'language': language
-                            })
-                return tracks
-            else:
-                self.process_queue.put(("LOG", f"Warning: ffprobe failed for audio tracks in {os.path.basename(file_path)}"))
-                return []
-        except subprocess.TimeoutExpired:
-            self.process_queue.put(("LOG", f"Warning: Timeout getting audio tracks for {os.path.basename(file_path)}"))
-            return []
-        except Exception as e:
-            self.process_queue.put(("LOG", f"Warning: Error getting audio tracks for {os.path.basename(file_path)}: {str(e)}"))
-            return []
+            process = subprocess.run(command, stdin=subprocess.DEVNULL, capture_output=True, check=True,
+                                     timeout=FFPROBE_TIMEOUT, creationflags=SUBPROCESS_CREATION_FLAGS)
+        except subprocess.CalledProcessError:
+            if fast:
+                return self._probe_file(file_path, fast=False)
+            raise
+        data = load_json_bytes(process.stdout or b"{}")
+        if fast and not data.get('streams'):
+            return self._probe_file(file_path, fast=False)
+
+        info = {'has_video': False, 'fps_num': None, 'fps_den': None, 'duration': 0, 'audio_tracks': []}
+        for stream in data.get('streams', []):
+            codec_type = stream.get('codec_type')
+            if codec_type == 'video' and not info['has_video']:
+                # First video stream (v:0) provides the frame rate
+                info['has_video'] = True
+                info['fps_num'], info['fps_den'] = self._parse_frame_rate(stream.get('avg_frame_rate'))
+            elif codec_type == 'audio':
+                info['audio_tracks'].append({
+                    'index': int(stream.get('index', len(info['audio_tracks']))),
+                    'codec': stream.get('codec_name', 'unknown'),
+                    'channels': str(stream.get('channels', '')),
+                    'language': stream.get('tags', {}).get('language') or "und"
+                })
 
-    def validate_video_file(self, file_path):
-        """Validate that a file is a readable video file using ffprobe."""
         try:
-            command = [self.ffprobe_path, "-v", "error", "-select_streams", "v:0",
-                       "-show_entries", "stream=codec_name", "-of",
-                       "default=noprint_wrappers=1:nokey=1", file_path]
+            info['duration'] = float(data.get('format', {}).get('duration', 0))
+        except (TypeError, ValueError):
+            pass
 
-            result = subprocess.run(command, capture_output=True, text=True, timeout=FFPROBE_TIMEOUT,
-                                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0)
-            return result.returncode == 0 and result.stdout.strip()
-        except subprocess.TimeoutExpired:
-            self.process_queue.put(("LOG", f"Warning: Timeout validating {os.path.basename(file_path)}"))
-            return False
-        except Exception as e:
-            self.process_queue.put(("LOG", f"Warning: Error validating {os.path.basename(file_path)}: {str(e)}"))
-            return False
+        if fast and not info['fps_den']:
+            return self._probe_file(file_path, fast=False)
+        info['fast_probe'] = fast
+        return info
 
-    def get_video_duration(self, file_path):
-        """Get video duration in seconds."""
+    def _parse_frame_rate(self, frame_rate):
+        """Parse an ffprobe rate such as '30000/1001' into (num, den), or (None, None)."""
+        if not frame_rate or frame_rate == "0/0":
+            return None, None
         try:
-            command = [self.ffprobe_path, "-v", "error", "-show_entries", "format=duration",
-                       "-of", "default=noprint_wrappers=1:nokey=1", file_path]
-
-            result = subprocess.run(command, capture_output=True, text=True, timeout=FFPROBE_TIMEOUT,
-                                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0)
-            if result.returncode == 0:
-                return float(result.stdout.strip())
-            else:
-                self.process_queue.put(("LOG", f"Warning: ffprobe failed to get duration for {os.path.basename(file_path)}"))
-                return 0
-        except subprocess.TimeoutExpired:
-            self.process_queue.put(("LOG", f"Warning: Timeout getting duration for {os.path.basename(file_path)}"))
-            return 0
+            num, sep, den = frame_rate.partition('/')
+            if sep:
+                num, den = int(num), int(den)
+                if den == 0 or num == 0:
+                    return None, None
+                return num, den
+            rate = Fraction(frame_rate)
+            return rate.numerator, rate.denominator
         except ValueError:
-            self.process_queue.put(("LOG", f"Warning: Invalid duration format for {os.path.basename(file_path)}"))
-            return 0
-        except Exception as e:
-            self.process_queue.put(("LOG", f"Warning: Error getting duration for {os.path.basename(file_path)}: {str(e)}"))
-            return 0
-
-    def build_ffmpeg_command(self, video_file_path, settings):
-        """Build FFmpeg command for remuxing a video file."""
-        file_name = os.path.basename(video_file_path)
-        file_name_no_ext = os.path.splitext(file_name)[0]
-        output_dir_final = settings["output_dir"] or os.path.dirname(video_file_path)
-        output_file_path = os.path.join(output_dir_final, file_name_no_ext + settings["output_format"])
-
-        command = [self.ffmpeg_path, "-y", "-i", video_file_path, "-c:v", "copy"]
-
-        # Handle audio mapping
-        if settings["include_audio"]:
-            # Map all audio streams (simplified behavior)
-            command.extend(["-map", "0:v", "-map", "0:a", "-c:a", "copy"])
-        else:
-            command.extend(["-an"])
+            return None, None
+
+    def get_output_file_path(self, video_file_path, settings):
+        """Return the remux output path for a video file."""
+        # One split covers both the directory and the file name
+        source_dir, file_name = os.path.split(video_file_path)
+        output_dir_final = settings["output_dir"] or source_dir
+        return os.path.join(output_dir_final, os.path.splitext(file_name)[0] + settings["output_format"])
+
+    def build_ffmpeg_command(self, video_file_path, settings, log_warnings=True):
+        """Build FFmpeg command for remuxing a video file (also used for the preview)."""
+        output_file_path = self.get_output_file_path(video_file_path, settings)
+
+        audio_args = FFMPEG_AUDIO_COPY_ARGS if settings["include_audio"] else FFMPEG_NO_AUDIO_ARGS
+        command = [self.ffmpeg_path, "-y", *FFMPEG_PROGRESS_ARGS, "-i", video_file_path, "-c:v", "copy", *audio_args]
 
         # Handle timescale options
         if settings["use_timescale"]:
-            timescale = None
-            scan_result = settings["scan_results"].get(video_file_path, {})
-            timescale = scan_result.get('fps')
-            if not timescale:
-                self.process_queue.put(("LOG", f"Warning: No FPS found for {file_name}, timescale option skipped."))
-
+            # The scan stores fps as validated integers, so the string needs no re-checking
+            timescale = self.get_fps_string(settings["scan_results"].get(video_file_path, {}))
             if timescale:
-                try:
-                    float(timescale)
-                    command.extend(["-video_track_timescale", str(timescale)])
-                except ValueError:
-                    self.process_queue.put(("LOG", f"Warning: Invalid timescale '{timescale}', skipping option."))
+                command.extend(["-video_track_timescale", timescale])
+            elif log_warnings:
+                self.process_queue.append(("LOG", f"Warning: No FPS found for {os.path.basename(video_file_path)}, timescale option skipped."))
 
         command.append(output_file_path)
 
@@ -2736,6 +3080,7 @@ class RemuxApp(QMainWindow):
             return
 
         self.preview_window = QDialog(self)
+        self.countdown_timer = None  # Only auto-start dialogs get a countdown timer
         self.preview_window.setWindowTitle("Command Preview")
         self.preview_window.setModal(True)
         self.preview_window.resize(800, 500)
@@ -2746,11 +3091,11 @@ class RemuxApp(QMainWindow):
         info_label = QLabel(f"Preview of commands for {len(self.files_to_process)} files:")
         layout.addWidget(info_label)
 
-        # Text widget with scrollbar
-        text_widget = QTextEdit()
+        # Text widget with scrollbar (plain text widget lays out large previews much faster)
+        text_widget = QPlainTextEdit()
         text_widget.setFont(QFont("Consolas", 9))  # Better monospace font
         text_widget.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #f8f9fa;
                 border: 1px solid #dee2e6;
                 border-radius: 4px;
@@ -2759,13 +3104,15 @@ class RemuxApp(QMainWindow):
         """)
         layout.addWidget(text_widget)
 
-        # Generate and display commands
+        # Generate and display commands, setting the text once instead of per line
         commands = self.generate_preview_commands()
+        lines = []
         for i, (input_file, command) in enumerate(commands, 1):
             filename = os.path.basename(input_file)
-            text_widget.append(f"{i}. {filename}")
-            text_widget.append(" ".join(command))
-            text_widget.append("")
+            lines.append(f"{i}. {filename}")
+            lines.append(" ".join(command))
+            lines.append("")
+        text_widget.setPlainText("\n".join(lines))
 
         # Button container frame
         button_container = QHBoxLayout()
@@ -2783,24 +3130,29 @@ class RemuxApp(QMainWindow):
             start_btn.clicked.connect(lambda: self.start_remuxing_from_preview(self.preview_window))
             button_container.addWidget(start_btn)
 
+            # One repeating timer drives the countdown; it's owned by the dialog
+            self.countdown_timer = QTimer(self.preview_window)
+            self.countdown_timer.setInterval(1000)
+
             # Countdown timer function
             def update_countdown():
                 if not self.countdown_active or not self.preview_window.isVisible():
+                    self.countdown_timer.stop()
                     return
 
                 self.countdown_seconds -= 1
                 if self.countdown_seconds > 0:
                     start_btn.setText(f"Start Remuxing (Auto-start in {self.countdown_seconds}s)")
-                    # Schedule next update in 1 second
-                    QTimer.singleShot(1000, update_countdown)
                 else:
+                    self.countdown_timer.stop()
                     start_btn.setText("Starting Remux...")
                     # Auto-start remuxing
                     if self.preview_window.isVisible():
                         self.start_remuxing_from_preview(self.preview_window)
 
             # Start countdown timer
-            QTimer.singleShot(1000, update_countdown)  # Start updating after 1 second
+            self.countdown_timer.timeout.connect(update_countdown)
+            self.countdown_timer.start()  # First update after 1 second
         else:
             start_btn = QPushButton("Start Remuxing")
             start_btn.clicked.connect(lambda: self.start_remuxing_from_preview(self.preview_window))
@@ -2808,7 +3160,7 @@ class RemuxApp(QMainWindow):
 
         # Close button
         close_btn = QPushButton("Close")
-        close_btn.clicked.connect(lambda: [setattr(self, 'countdown_active', False), self.preview_window.reject()])
+        close_btn.clicked.connect(self.close_preview_dialog)
         button_container.addWidget(close_btn)
 
         # ADD THIS LINE to execute the dialog and return its result
@@ -2816,48 +3168,34 @@ class RemuxApp(QMainWindow):
 
     def generate_preview_commands(self):
         """Generate preview of all FFmpeg commands."""
-        commands = []
         settings = {
             "output_dir": self.output_directory,
             "include_audio": self.include_audio,
             "use_timescale": self.use_timescale_option,
             "scan_results": self.scan_results,
+            "output_format": self.output_format,
         }
 
-        for video_file_path in self.files_to_process:
-            file_name = os.path.basename(video_file_path)
-            file_name_no_ext = os.path.splitext(file_name)[0]
-            output_dir_final = settings["output_dir"] or os.path.dirname(video_file_path)
-            output_file_path = os.path.join(output_dir_final, file_name_no_ext + self.output_format)
-
-            command = [self.ffmpeg_path, "-y", "-i", video_file_path, "-c:v", "copy"]
-
-            # Handle audio mapping
-            if settings["include_audio"]:
-                # Map all audio streams (simplified behavior)
-                command.extend(["-map", "0:v", "-map", "0:a", "-c:a", "copy"])
-            else:
-                command.extend(["-an"])
-
-            if settings["use_timescale"]:
-                timescale = None
-                scan_result = settings["scan_results"].get(video_file_path, {})
-                timescale = scan_result.get('fps')
-                if timescale:
-                    try:
-                        float(timescale)
-                        command.extend(["-video_track_timescale", str(timescale)])
-                    except ValueError:
-                        pass
+        # Same builder as the remux worker, so the preview always matches what runs
+        return [
+            (video_file_path, self.build_ffmpeg_command(video_file_path, settings, log_warnings=False)[0])
+            for video_file_path in self.files_to_process
+        ]
 
-            command.append(output_file_path)
-            commands.append((video_file_path, command))
+    def stop_preview_countdown(self):
+        """Stop the preview auto-start countdown, if one is running."""
+        self.countdown_active = False
+        if self.countdown_timer is not None:
+            self.countdown_timer.stop()
 
-        return commands
+    def close_preview_dialog(self):
+        """Stop any countdown and reject the preview dialog."""
+        self.stop_preview_countdown()
+        self.preview_window.reject()
 
     def start_remuxing_from_preview(self, preview_window):
         """Closes the preview dialog and signals acceptance."""
-        self.countdown_active = False  # Stop countdown if user manually clicked
+        self.stop_preview_countdown()  # Stop countdown if user manually clicked
         preview_window.accept() # This closes the dialog and returns an "Accepted" result
 
 # =============================================================================